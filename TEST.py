@@ -9,18 +9,18 @@ For info: see Desire in Chromatic Harmony by Kenneth Smith (Oxford, 2020).
 
 import os
 import platform
+import re
 import sys
 import threading
+from bisect import bisect_right
+from collections import deque
 from typing import Callable, Dict, List, Optional, Tuple, Any, Set
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, Text, BooleanVar, Frame, Label
 import tkinter.font as tkfont
 
-from PIL import Image, ImageDraw, ImageTk
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas as pdf_canvas
-from reportlab.lib.colors import black, HexColor
+from PIL import Image, ImageTk
 from music21 import converter, note, chord as m21chord, meter, stream
 
 # Import MIDI library at top level for PyInstaller compatibility
@@ -88,9 +88,24 @@ CLEAN_STACK_SYMBOL = "✅"  # Indicates clean stacked chord voicing
 ROOT2_SYMBOL = "²"         # Second inversion marker
 ROOT3_SYMBOL = "³"         # Third inversion marker
 
+# Single-pass flat/sharp substitution table for beautify_chord
+_CHORD_TRANS = str.maketrans({"b": "♭", "#": "♯"})
+# ...and its inverse, for parsing chord names that were already beautified
+_ASCII_ACCIDENTALS_TRANS = str.maketrans({"♭": "b", "♯": "#"})
+
 def beautify_chord(chord: str) -> str:
     """Convert flat (b) and sharp (#) symbols to proper musical notation."""
-    return chord.replace("b", "♭").replace("#", "♯")
+    return chord.translate(_CHORD_TRANS)
+
+def chord_marker(info: dict) -> str:
+    """Return the clean-stack / root-doubling symbols for a chord's chord_info entry."""
+    marker = CLEAN_STACK_SYMBOL if info.get("clean_stack") else ""
+    root_count = info.get("root_count", 1)
+    if root_count == 2:
+        return marker + ROOT2_SYMBOL
+    if root_count >= 3:
+        return marker + ROOT3_SYMBOL
+    return marker
 
 # Music theory constants and chord definitions
 NOTE_TO_SEMITONE = {
@@ -99,6 +114,14 @@ NOTE_TO_SEMITONE = {
     'A#': 10, 'Bb': 10, 'B': 11
 }
 
+# Reverse lookup used by semitone_to_note: the natural name when there is one,
+# otherwise the first spelling listed in NOTE_TO_SEMITONE (sharps)
+SEMITONE_TO_NOTE = {}
+for _name, _semitone in NOTE_TO_SEMITONE.items():
+    if _semitone not in SEMITONE_TO_NOTE or len(_name) == 1:
+        SEMITONE_TO_NOTE[_semitone] = _name
+del _name, _semitone
+
 # Chord patterns defined as semitone intervals from root
 CHORDS = {
     "C7": [0, 4, 7, 10], "C7b5": [0, 4, 6, 10], "C7#5": [0, 4, 8, 10],
@@ -109,6 +132,40 @@ CHORDS = {
 }
 
 TRIADS = {"C", "Cm", "Caug"}  # Basic three-note chords
+
+# 12-bit pitch-class masks of CHORDS (bit n set = interval n present above the root)
+CHORD_MASKS = {name: sum(1 << n for n in intervals) for name, intervals in CHORDS.items()}
+
+
+def pitch_class_mask(semitones) -> int:
+    """Return the 12-bit pitch-class mask of an iterable of semitones."""
+    mask = 0
+    for n in semitones:
+        mask |= 1 << (n % 12)
+    return mask
+
+
+def rotate_mask(mask: int, root: int) -> int:
+    """Transpose a pitch-class mask so that `root` becomes pitch class 0."""
+    return ((mask >> root) | (mask << (12 - root))) & 0xFFF if root else mask
+
+
+def mask_size(mask: int) -> int:
+    """Number of pitch classes present in a pitch-class mask."""
+    return bin(mask).count("1")
+
+
+def mask_to_pitch_classes(mask: int) -> Set[int]:
+    """Expand a pitch-class mask back into a set of pitch classes."""
+    return {pc for pc in range(12) if mask >> pc & 1}
+
+
+# CHORD_MASKS transposed to every root: CHORD_MASKS_BY_ROOT[name][root]
+CHORD_MASKS_BY_ROOT = {
+    name: tuple(rotate_mask(mask, (12 - root) % 12) for root in range(12))
+    for name, mask in CHORD_MASKS.items()
+}
+
 CIRCLE_OF_FIFTHS_ROOTS = ['F#', 'B', 'E', 'A', 'D', 'G', 'C', 'F', 'Bb', 'Eb', 'Ab', 'Db', 'Gb']
 
 # Enharmonic equivalents for note normalization
@@ -129,6 +186,43 @@ ENHARMONIC_EQUIVALENTS = {
     'Abbb': 'Gb', 'Bbbb': 'G', 'Cbbb': 'A', 'Dbbb': 'Bb', 'Ebbb': 'C', 'Fbbb': 'Db', 'Gbbb': 'Eb',
 }
 
+# Canonical spelling for each pitch class (matches the ENHARMONIC_EQUIVALENTS targets)
+CANONICAL_NOTE_NAMES = ['C', 'Db', 'D', 'Eb', 'E', 'F', 'F#', 'G', 'Ab', 'A', 'Bb', 'B']
+
+
+def canonical_root(name: str) -> str:
+    """Return the canonical spelling of a note name by counting accidentals, e.g. 'A#' -> 'Bb'."""
+    accidentals = name[1:]
+    offset = accidentals.count('#') - accidentals.count('b')
+    return CANONICAL_NOTE_NAMES[(NOTE_TO_SEMITONE[name[0]] + offset) % 12]
+
+
+def chord_root(chord_name: str) -> Optional[str]:
+    """Return the root note name a chord name starts with (longest match, e.g. 'Bb7' -> 'Bb'), or None."""
+    # Note names are one or two characters, so try the two-character prefix first
+    root = chord_name[:2]
+    if root in NOTE_TO_SEMITONE:
+        return root
+    root = chord_name[:1]
+    return root if root in NOTE_TO_SEMITONE else None
+
+
+# chord name -> chord quality, filled in as chord names are first seen
+_CHORD_QUALITIES: Dict[str, str] = {}
+
+
+def chord_quality(chord_name: str) -> str:
+    """Return the quality part of a chord name, e.g. 'Bb7b5' -> '7b5', as used for priority lookups."""
+    quality = _CHORD_QUALITIES.get(chord_name)
+    if quality is None:
+        base = chord_name
+        root = chord_root(chord_name)
+        if root:
+            base = chord_name.replace(root, 'C')
+        # Remove the 'C' prefix to get the chord quality
+        quality = _CHORD_QUALITIES[chord_name] = base[1:] if base.startswith('C') else base
+    return quality
+
 # Event merging algorithm parameters (default values for position 3 of 7-position slider)
 MERGE_JACCARD_THRESHOLD = 0.60  # Chord similarity threshold (0.0-1.0, higher = stricter)
 MERGE_BASS_OVERLAP = 0.50       # Required bass note overlap for merging (0.0-1.0)
@@ -192,50 +286,6 @@ class MidiChordAnalyzer(tk.Tk):
     - Advanced event merging with configurable sensitivity
     """
     
-    def debug_print_notes(self):
-        """Print all notes and chords with bar, beat, and duration for debugging."""
-        if not self.score:
-            print("No score loaded.")
-            return
-        flat_notes = list(self.score.flatten().getElementsByClass([note.Note, m21chord.Chord]))
-        # Use local offset_to_bar_beat from analyze_musicxml
-        def offset_to_bar_beat(offset):
-            # Find the last time signature whose offset is <= given offset
-            time_signatures = []
-            for ts in self.score.flatten().getElementsByClass(meter.TimeSignature):
-                offset_ts = float(ts.offset)
-                time_signatures.append((offset_ts, int(ts.numerator), int(ts.denominator)))
-            time_signatures.sort(key=lambda x: x[0])
-            if not time_signatures:
-                num, denom = 4, 4
-                return 1, int(offset) + 1, f"{num}/{denom}"
-            elif time_signatures[0][0] > 0.0:
-                first_num, first_den = time_signatures[0][1], time_signatures[0][2]
-                time_signatures.insert(0, (0.0, first_num, first_den))
-            bars_before = 0
-            for i, (t_off, num, denom) in enumerate(time_signatures):
-                next_off = time_signatures[i + 1][0] if i + 1 < len(time_signatures) else None
-                beat_len = 4.0 / denom
-                if next_off is None or offset < next_off:
-                    beats_since_t = (offset - t_off) / beat_len
-                    if beats_since_t < 0:
-                        beats_since_t = (offset) / beat_len
-                        bars = int(beats_since_t // num)
-                        beat = int(beats_since_t % num) + 1
-                        return bars + 1, beat, f"{num}/{denom}"
-                    bar_in_segment = int(beats_since_t // num)
-                    beat = int(beats_since_t % num) + 1
-                    return bars_before + bar_in_segment + 1, beat, f"{num}/{denom}"
-                else:
-                    segment_beats = (next_off - t_off) / beat_len
-                    bars_in_segment = int(segment_beats // num)
-                    bars_before += bars_in_segment
-            num, denom = time_signatures[-1][1], time_signatures[-1][2]
-            beat_len = 4.0 / denom
-            beats = offset / beat_len
-            return int(beats // num) + 1, int(beats % num) + 1, f"{num}/{denom}"
-
-
     def __init__(self):
         super().__init__()
         self.title("🎵 MIDI Drive Analyzer")
@@ -268,7 +318,6 @@ class MidiChordAnalyzer(tk.Tk):
         self.configure(bg="black")
 
         # Configure dark theme styles
-        from tkinter import ttk
         style = ttk.Style()
         style.configure("White.TCheckbutton", background="black", foreground="white", focuscolor="black")
         style.configure("White.TRadiobutton", background="black", foreground="white", focuscolor="black")
@@ -306,6 +355,10 @@ class MidiChordAnalyzer(tk.Tk):
         self.score = None
         self.analyzed_events = None
         self.processed_events = None
+        # (path, mtime, analysis settings) -> (lines, events) from previous runs
+        self._analysis_cache = {}
+        # (pitch-class masks, chord settings) -> chords found by detect_chords
+        self._chord_cache = {}
         
         # Drive strength parameters (configurable via dialog)
         self.custom_strength_map = None
@@ -357,7 +410,8 @@ class MidiChordAnalyzer(tk.Tk):
                          "font": ("Segoe UI", 10)}
             disabled_fg = "#808080"
 
-        tk.Button(frame, text="Load XML", command=self.load_music_file, **btn_kwargs).pack(side="left", padx=5)
+        self.load_btn = tk.Button(frame, text="Load XML", command=self.load_music_file, disabledforeground=disabled_fg, **btn_kwargs)
+        self.load_btn.pack(side="left", padx=5)
         self.settings_btn = tk.Button(
             frame,
             text="Settings",
@@ -415,51 +469,34 @@ class MidiChordAnalyzer(tk.Tk):
             highlightbackground="black", highlightcolor="black"
         )
         self.result_text.pack(fill="both", expand=True, padx=10, pady=10)
-
-    def create_piano_image(self, octaves=2, key_width=40, key_height=150):
-        """Generate a piano keyboard image with highlighted drive tones (G, B, D, F)."""
-        white_keys = ['C', 'D', 'E', 'F', 'G', 'A', 'B']
-        black_keys = ['C#', 'D#', '', 'F#', 'G#', 'A#', '']
-        total_white_keys = 7 * octaves
-        img_width = total_white_keys * key_width
-        img_height = key_height
-        img = Image.new('RGB', (img_width, img_height), color='white')
-        draw = ImageDraw.Draw(img)
-
-        for i in range(total_white_keys):
-            x = i * key_width
-            octave_idx = i // 7
-            note = white_keys[i % 7]
-            if (octave_idx == 0 and note in ['G', 'B']) or (octave_idx == 1 and note in ['D', 'F']):
-                fill_color = '#ff00ff'
-            else:
-                fill_color = 'white'
-            draw.rectangle([x, 0, x + key_width, key_height], fill=fill_color, outline='black')
-
-        for octave in range(octaves):
-            for i, key in enumerate(black_keys):
-                if key != '':
-                    x = (octave * 7 + i) * key_width + int(key_width*0.7)
-                    draw.rectangle([x, 0, x + int(key_width*0.6), int(key_height*0.6)], fill='black')
-
-        return img
+        # Splash tags are configured once here rather than on every show_splash
+        self.result_text.tag_configure("splash_font", font=("Segoe UI", 11), foreground="white")
+        self.result_text.tag_configure("center", justify="center")
+
+    def _load_photo(self, *path_parts):
+        """Load an asset as a Tk PhotoImage once and reuse it on later calls."""
+        cache = getattr(self, '_photo_cache', None)
+        if cache is None:
+            cache = self._photo_cache = {}
+        photo = cache.get(path_parts)
+        if photo is None:
+            img = Image.open(resource_path(os.path.join(*path_parts)))
+            photo = ImageTk.PhotoImage(img)
+            cache[path_parts] = photo
+        return photo
 
     def show_splash(self):
         self.result_text.delete("1.0", "end")
         # Configure text spacing to eliminate gray stripes
         self.result_text.configure(spacing1=0, spacing2=0, spacing3=0)
         
-        # Configure Segoe UI font tag for splash text
-        self.result_text.tag_configure("splash_font", font=("Segoe UI", 11), foreground="white")
         # Insert the title.png image centered
         try:
-            from PIL import Image, ImageTk
-            img_path = resource_path(os.path.join("assets", "title.png"))
-            title_img = Image.open(img_path)
-            title_photo = ImageTk.PhotoImage(title_img)
+            title_photo = self._load_photo("assets", "title.png")
             title_label = tk.Label(self.result_text, image=title_photo, bd=0, bg="black", highlightthickness=0)
             title_label.image = title_photo  # Keep a reference!
             self.result_text.window_create("1.0", window=title_label)
+            self.result_text.tag_add("center", "1.0", "1.end")
             self.result_text.insert("end", "\n")
         except Exception as e:
             # Insert fallback title with Segoe UI font
@@ -480,19 +517,15 @@ class MidiChordAnalyzer(tk.Tk):
             "Kenneth Smith, “The Enigma of Entropy in Extended Tonality.” Music Theory Spectrum 43, no. 1 (2021): 1–18."
         )
         
-        # Insert description text with Segoe UI font
+        # Add copyright notice
+        copyright_text = "\n\n© Kenneth Smith, 2026"
+
+        # Insert description and copyright with Segoe UI font in one call
         start_pos = self.result_text.index("end")
-        self.result_text.insert("end", description)
+        self.result_text.insert("end", description + copyright_text)
         end_pos = self.result_text.index("end")
         self.result_text.tag_add("splash_font", start_pos, end_pos)
         
-        # Add copyright notice
-        copyright_text = "\n\n© Kenneth Smith, 2026"
-        copyright_start = self.result_text.index("end")
-        self.result_text.insert("end", copyright_text)
-        copyright_end = self.result_text.index("end")
-        self.result_text.tag_add("splash_font", copyright_start, copyright_end)
-        
         self.result_text.configure(state="disabled")
        
     def preview_entropy(self, mode: str = "chord", base: int = 2):
@@ -519,10 +552,67 @@ class MidiChordAnalyzer(tk.Tk):
         if not path:
             return
         else:
-            self.loaded_file_path = path
-            self.score = converter.parse(path)
-            self.debug_print_notes()
-            self.run_analysis()
+            # Parse off the Tk thread so the window stays responsive on large scores; the worker
+            # only queues its result, which _poll_parse picks up on the Tk thread
+            self.load_btn.config(state="disabled")
+            results = deque()
+            threading.Thread(target=self._parse_in_bg, args=(path, results), daemon=True).start()
+            self._poll_parse(results)
+
+    def _parse_in_bg(self, path, results):
+        """Worker thread: parse the score and queue (path, score) or the exception; no Tk calls here."""
+        try:
+            results.append((path, converter.parse(path)))
+        except Exception as e:
+            results.append(e)
+
+    def _poll_parse(self, results):
+        """Hand the worker's result to _on_parsed/_on_parse_failed once it arrives, else poll again in 50 ms."""
+        if not results:
+            self.after(50, self._poll_parse, results)
+            return
+        result = results.popleft()
+        if isinstance(result, Exception):
+            self._on_parse_failed(result)
+        else:
+            self._on_parsed(*result)
+
+    def _on_parsed(self, path, score):
+        self.load_btn.config(state="normal")
+        self.loaded_file_path = path
+        self._analysis_cache = {}
+        self.score = score
+        self.run_analysis()
+
+    def _on_parse_failed(self, error):
+        self.load_btn.config(state="normal")
+        self.result_text.config(state="normal")
+        self.result_text.delete("1.0", "end")
+        self.result_text.insert("end", f"Error loading file:\n{error}")
+        self.result_text.config(state="disabled")
+
+    def _analysis_cache_key(self):
+        """Key for the settings that change detected events (display-only options are excluded)."""
+        path = getattr(self, 'loaded_file_path', None)
+        if not path:
+            return None
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        strength_map = self.custom_strength_map
+        return (
+            path, mtime,
+            self.analysis_mode, self.segment_size,
+            getattr(self, 'min_duration', 0.0),
+            self.include_triads, self.include_anacrusis,
+            self.arpeggio_searching, self.neighbour_notes_searching,
+            self.arpeggio_block_similarity_threshold, self.pedal_mode,
+            self.collapse_similar_events,
+            self.merge_jaccard_threshold, self.merge_bass_overlap,
+            self.merge_bar_distance, self.merge_diff_max,
+            tuple(sorted(strength_map.items())) if strength_map else None,
+        )
 
     def run_analysis(self):
         """Execute full chord analysis pipeline and update UI."""
@@ -530,10 +620,18 @@ class MidiChordAnalyzer(tk.Tk):
         self.analyzed_events = None
         self.processed_events = None
         try:
-            if self.analysis_mode == "time_segment":
-                lines, events = self.analyze_musicxml_time_segments(self.score)
+            # Reuse events when only display options (repeats, non-drive events) changed
+            cache = getattr(self, '_analysis_cache', None)
+            cache_key = self._analysis_cache_key() if cache is not None else None
+            if cache_key is not None and cache_key in cache:
+                lines, events = cache[cache_key]
             else:
-                lines, events = self.analyze_musicxml(self.score, min_duration=min_duration)
+                if self.analysis_mode == "time_segment":
+                    lines, events = self.analyze_musicxml_time_segments(self.score)
+                else:
+                    lines, events = self.analyze_musicxml(self.score, min_duration=min_duration)
+                if cache_key is not None:
+                    cache[cache_key] = (lines, events)
             self.analyzed_events = events
 
             self.display_results()
@@ -596,10 +694,7 @@ class MidiChordAnalyzer(tk.Tk):
 
         # Load and display settings title image at top center
         try:
-            from PIL import Image, ImageTk
-            title_img_path = resource_path(os.path.join("assets", "images", "settings_title.png"))
-            title_img = Image.open(title_img_path)
-            title_photo = ImageTk.PhotoImage(title_img)
+            title_photo = self._load_photo("assets", "images", "settings_title.png")
             title_label = tk.Label(dialog, image=title_photo, bd=0, bg="#f5f5f5", highlightthickness=0)
             title_label.image = title_photo  # Keep a reference
             title_label.pack(pady=(10, 15))
@@ -648,7 +743,6 @@ class MidiChordAnalyzer(tk.Tk):
             info_photo = None
         
         # Configure styles for settings dialog
-        from tkinter import ttk
         style = ttk.Style()
         style.configure("Settings.TCheckbutton", background="#f5f5f5", foreground="black")
         style.configure("Settings.TLabel", background="#f5f5f5", foreground="black")
@@ -1064,10 +1158,18 @@ class MidiChordAnalyzer(tk.Tk):
             # Remove immediately repeated patterns if option is enabled
             if self.analyzed_events and getattr(self, 'remove_repeats', False):
                 def event_signature(event):
+                    # Order-free signature, cached on the event so repeated displays reuse it
                     data = event[1]
-                    chords = tuple(sorted(data["chords"]))
-                    basses = tuple(sorted(data["basses"]))
-                    return (chords, basses)
+                    sig = data.get("_sig")
+                    if sig is None:
+                        sig = data["_sig"] = (frozenset(data["chords"]), frozenset(data["basses"]))
+                    return sig
+
+                # Build each signature once and intern it to a small int so the
+                # pattern scan compares ints (via C-level list slices) instead of
+                # re-sorting chords/basses for every candidate comparison
+                sig_ids: Dict[Tuple, int] = {}
+                ids = [sig_ids.setdefault(event_signature(ev), len(sig_ids)) for ev in events]
 
                 filtered = []
                 i = 0
@@ -1076,25 +1178,12 @@ class MidiChordAnalyzer(tk.Tk):
                     max_pat = (n - i) // 2
                     found_repeat = False
                     for pat_len in range(1, max_pat + 1):
-                        pat = [event_signature(events[i + j]) for j in range(pat_len)]
-                        repeat = True
-                        for j in range(pat_len):
-                            if i + pat_len + j >= n or event_signature(events[i + j]) != event_signature(events[i + pat_len + j]):
-                                repeat = False
-                                break
-                        if repeat:
+                        pat = ids[i:i + pat_len]
+                        if pat == ids[i + pat_len:i + 2 * pat_len]:
                             # keep the first occurrence, then skip any number of consecutive repeats
-                            jpos = i + pat_len
-                            while jpos + pat_len <= n:
-                                all_match = True
-                                for k in range(pat_len):
-                                    if event_signature(events[i + k]) != event_signature(events[jpos + k]):
-                                        all_match = False
-                                        break
-                                if all_match:
-                                    jpos += pat_len
-                                else:
-                                    break
+                            jpos = i + 2 * pat_len
+                            while jpos + pat_len <= n and ids[jpos:jpos + pat_len] == pat:
+                                jpos += pat_len
                             filtered.extend(events[i:i+pat_len])
                             i = jpos
                             found_repeat = True
@@ -1104,14 +1193,10 @@ class MidiChordAnalyzer(tk.Tk):
                         i += 1
                 events = filtered
 
-            # Determine whether any drive (recognized chord) exists in the event list
-            has_any_drives = any(data.get('chords') for (_, data) in events)
-
             if lines is not None:
                 # Store the events as-is when displaying pre-formatted lines
                 self.processed_events = events.copy()
-                for line in lines:
-                    self.result_text.insert("end", line)
+                self.result_text.insert("end", "".join(lines))
             elif events:
                 # Collect the ACTUAL events that get displayed after all filtering
                 displayed_events = []
@@ -1119,19 +1204,9 @@ class MidiChordAnalyzer(tk.Tk):
                 prev_no_drive = False
                 prev_bass = None
                 for (bar, beat, ts), data in events:
-                    chords = sorted(data["chords"])
+                    chords = data.get("sorted_chords") or sorted(data["chords"])
                     chord_info = data.get("chord_info", {})
-                    chord_strs = []
-                    for chord in chords:
-                        marker = ""
-                        if chord_info.get(chord, {}).get("clean_stack"):
-                            marker += CLEAN_STACK_SYMBOL
-                        root_count = chord_info.get(chord, {}).get("root_count", 1)
-                        if root_count == 2:
-                            marker += ROOT2_SYMBOL
-                        elif root_count >= 3:
-                            marker += ROOT3_SYMBOL
-                        chord_strs.append(f"{chord}{marker}")
+                    chord_strs = [f"{chord}{chord_marker(chord_info.get(chord, {}))}" for chord in chords]
                     chords_display = ", ".join(chord_strs) if chord_strs else ""
                     bass = "+".join(data["basses"])
                     is_no_drive = len(chord_strs) == 0
@@ -1162,7 +1237,6 @@ class MidiChordAnalyzer(tk.Tk):
                     f"\nLegend:\n{CLEAN_STACK_SYMBOL} = Clean stack   {ROOT2_SYMBOL} = Root doubled   {ROOT3_SYMBOL} = Root tripled or more\n"
                 )
                 # Replace musical symbols before displaying - only after note names
-                import re
                 final_output = "".join(output_lines)
                 # Replace flats: note names followed by 'b' OR 'b' followed by numbers (chord extensions)
                 final_output = re.sub(r'([ABCDEFG])b', r'\1♭', final_output)  # Direct note flats like Db
@@ -1184,68 +1258,13 @@ class MidiChordAnalyzer(tk.Tk):
         4. Neighbor/passing note detection
         5. Event merging and post-processing
         """
-        flat_notes = list(score.flatten().getElementsByClass([note.Note, m21chord.Chord]))
+        # Notes/chords and time signatures for bar/beat calculation, in one pass
+        flat_notes, time_signatures = self._extract_notes_and_time_signatures(score)
 
-        # Extract time signatures for bar/beat calculation
-        time_signatures = []
-        for ts in score.flatten().getElementsByClass(meter.TimeSignature):
-            offset = float(ts.offset)
-            time_signatures.append((offset, int(ts.numerator), int(ts.denominator)))
-
-        time_signatures.sort(key=lambda x: x[0])
-
-        # Ensure we have at least one time signature
-        if not time_signatures:
-            time_signatures = [(0.0, 4, 4)]
-        elif time_signatures[0][0] > 0.0:
-            first_num, first_den = time_signatures[0][1], time_signatures[0][2]
-            time_signatures.insert(0, (0.0, first_num, first_den))
-
-        def get_time_signature(offset):
-            # Find the last time signature whose offset is <= given offset
-            ts = (4, 4)
-            for t_off, n, d in time_signatures:
-                if offset >= t_off:
-                    ts = (n, d)
-                else:
-                    break
-            return ts
-
-        def offset_to_bar_beat(offset):
-            # Map an absolute offset (in quarter lengths) to bar and beat
-            if not time_signatures:
-                num, denom = 4, 4
-                return 1, int(offset) + 1, f"{num}/{denom}"
-
-            # Walk through timesig segments and accumulate full bars
-            bars_before = 0
-            for i, (t_off, num, denom) in enumerate(time_signatures):
-                next_off = time_signatures[i + 1][0] if i + 1 < len(time_signatures) else None
-                beat_len = 4.0 / denom  # quarter lengths per beat
-
-                if next_off is None or offset < next_off:
-                    # offset lies in this segment
-                    beats_since_t = (offset - t_off) / beat_len
-                    if beats_since_t < 0:
-                        # offset before first timesig marker
-                        beats_since_t = (offset) / beat_len
-                        bars = int(beats_since_t // num)
-                        beat = int(beats_since_t % num) + 1
-                        return bars + 1, beat, f"{num}/{denom}"
-                    bar_in_segment = int(beats_since_t // num)
-                    beat = int(beats_since_t % num) + 1
-                    return bars_before + bar_in_segment + 1, beat, f"{num}/{denom}"
-                else:
-                    # full segment contributes whole bars
-                    segment_beats = (next_off - t_off) / beat_len
-                    bars_in_segment = int(segment_beats // num)
-                    bars_before += bars_in_segment
+        get_time_signature = self._make_time_signature_lookup(time_signatures)
+        ts_offsets = [t_off for t_off, _, _ in time_signatures]
 
-            # Fallback (shouldn't normally reach here)
-            num, denom = time_signatures[-1][1], time_signatures[-1][2]
-            beat_len = 4.0 / denom
-            beats = offset / beat_len
-            return int(beats // num) + 1, int(beats % num) + 1, f"{num}/{denom}"
+        offset_to_bar_beat = self._make_offset_to_bar_beat(time_signatures)
 
         def is_pedal_lift_point(offset, pedal_mode):
             """Determine if pedal lifts at this time point based on mode."""
@@ -1261,24 +1280,14 @@ class MidiChordAnalyzer(tk.Tk):
             beat_len = 4.0 / denom  # quarter lengths per beat
             
             # Calculate the exact start time of this bar
-            bar_start_offset = None
-            bars_before = 0
-            for i, (t_off, n, d) in enumerate(time_signatures):
-                next_off = time_signatures[i + 1][0] if i + 1 < len(time_signatures) else None
-                if next_off is None or offset < next_off:
-                    # This time signature applies to our offset
-                    segment_start = t_off
-                    beats_since_start = (offset - t_off) / beat_len
-                    bars_in_this_segment = int(beats_since_start // n)
-                    bar_start_offset = t_off + (bars_in_this_segment * n * beat_len)
-                    break
-                else:
-                    # Add complete bars from this segment
-                    segment_beats = (next_off - t_off) / beat_len
-                    bars_before += int(segment_beats // n)
-            
-            if bar_start_offset is None:
+            if not time_signatures:
                 return False
+            # The time signature that applies to our offset
+            i = max(bisect_right(ts_offsets, offset) - 1, 0)
+            t_off, n, d = time_signatures[i]
+            beats_since_start = (offset - t_off) / beat_len
+            bars_in_this_segment = int(beats_since_start // n)
+            bar_start_offset = t_off + (bars_in_this_segment * n * beat_len)
             
             # Only lift pedal at exact bar starts
             tolerance = 0.001  # Small tolerance for floating point precision
@@ -1305,7 +1314,14 @@ class MidiChordAnalyzer(tk.Tk):
                     return abs(offset - beat_start_offset) < tolerance
             return False
 
+        # Number of notes/chords (long enough to be analyzed) struck at each offset
+        onset_counts = {}
+        for elem in flat_notes:
+            if elem.quarterLength >= min_duration:
+                onset_counts[elem.offset] = onset_counts.get(elem.offset, 0) + 1
+
         note_events = []
+        note_masks = []  # pitch-class mask of each note_events entry, same index
         single_notes = []  # (start, end, pitch)
         for elem in flat_notes:
             if isinstance(elem, (note.Note, m21chord.Chord)):
@@ -1324,29 +1340,47 @@ class MidiChordAnalyzer(tk.Tk):
                 else:
                     pitches = [elem.pitch.midi]
                 note_events.append((start, end, pitches))
+                note_masks.append(pitch_class_mask(pitches))
                 # Collect single melodic notes (not part of a chord, not doubled at start)
                 if isinstance(elem, note.Note):
-                    others_at_start = [e for e in flat_notes if e is not elem and hasattr(e, 'offset') and e.offset == start and e.quarterLength >= min_duration]
-                    if not others_at_start:
+                    # Only this note is struck at its offset
+                    if onset_counts[start] == 1:
                         single_notes.append((start, end, pitches[0]))
 
         time_points = sorted(set([t for start, end, _ in note_events for t in [start, end]]))
 
-
+        # Bucket note events by their start and end times so each time point only
+        # visits the notes that begin or end there (note_events order is kept per bucket)
+        # Each entry is (pitches, pitch-class mask of those pitches)
+        events_starting_at = {}
+        events_ending_at = {}
+        for (start, end, pitches), pc_mask in zip(note_events, note_masks):
+            entry = (pitches, pc_mask)
+            events_starting_at.setdefault(start, []).append(entry)
+            events_ending_at.setdefault(end, []).append(entry)
+        singles_ending_at = {}
+        for single in single_notes:
+            singles_ending_at.setdefault(single[1], []).append(single)
 
         events = {}
-        active_notes = set()
+        # Pitch-class sets in the sweep are 12-bit masks (bit i set = pitch class i present)
+        active_notes = 0
         active_pitches = set()
         
         # Pedal-sustained notes (notes that started while pedal was down)
-        pedal_sustained_notes = set()
+        pedal_sustained_notes = 0
         pedal_sustained_pitches = set()
         last_pedal_lift_time = None
         
         # Auto pedal tracking
-        auto_pedal_collection = set()  # All pitch classes since last auto pedal lift
+        auto_pedal_collection = 0  # All pitch classes since last auto pedal lift
         auto_last_lift_time = 0.0
 
+        # Previous detection, reused while consecutive time points test the same pitch
+        # classes (detect_chords also reads test_pitches here, so their classes are part of the key)
+        prev_detect_key = None
+        prev_chords = []
+
         # === PHASE 1: Block Chord Detection ===
         for i, time in enumerate(time_points):
 
@@ -1354,8 +1388,8 @@ class MidiChordAnalyzer(tk.Tk):
             auto_pedal_lift = False
             if self.pedal_mode == "Auto":
                 # Auto pedal logic - three conditions for lifting
-                current_bar, current_beat, current_ts = offset_to_bar_beat(time)
-                bar_length = 4.0 * get_time_signature(time)[0] / get_time_signature(time)[1]  # Quarter lengths per bar
+                ts_num, ts_denom = get_time_signature(time)
+                bar_length = 4.0 * ts_num / ts_denom  # Quarter lengths per bar
                 
                 # Condition 1: Bar boundary (minimum frequency)
                 if time >= auto_last_lift_time + bar_length:
@@ -1364,9 +1398,8 @@ class MidiChordAnalyzer(tk.Tk):
                 # Condition 2: Mass note ending (3+ simultaneous pitches end)
                 if not auto_pedal_lift:
                     ending_count = 0
-                    for start, end, pitches in note_events:
-                        if end == time:
-                            ending_count += len(pitches)
+                    for pitches, _ in events_ending_at.get(time, ()):
+                        ending_count += len(pitches)
                     if ending_count >= 3:
                         auto_pedal_lift = True
                 
@@ -1374,77 +1407,81 @@ class MidiChordAnalyzer(tk.Tk):
                 if not auto_pedal_lift and auto_pedal_collection and active_notes:
                     intersection = auto_pedal_collection & active_notes
                     union = auto_pedal_collection | active_notes
-                    similarity = len(intersection) / len(union) if union else 1.0
+                    similarity = mask_size(intersection) / mask_size(union) if union else 1.0
                     if similarity < 0.5:
                         auto_pedal_lift = True
                 
                 if auto_pedal_lift:
-                    pedal_sustained_notes.clear()
+                    pedal_sustained_notes = 0
                     pedal_sustained_pitches.clear()
-                    auto_pedal_collection.clear()
+                    auto_pedal_collection = 0
                     auto_last_lift_time = time
             
             elif is_pedal_lift_point(time, self.pedal_mode):
-                pedal_sustained_notes.clear()
+                pedal_sustained_notes = 0
                 pedal_sustained_pitches.clear()
                 last_pedal_lift_time = time
                 
             # Track which notes end at this time
             ending_notes = []
-            for start, end, pitches in note_events:
-                if end == time:
-                    ending_notes.extend(pitches)
-                    active_notes.difference_update({p % 12 for p in pitches})
-                    active_pitches.difference_update(pitches)
+            for pitches, pc_mask in events_ending_at.get(time, ()):
+                ending_notes.extend(pitches)
+                active_notes &= ~pc_mask
+                active_pitches.difference_update(pitches)
 
             # Track which notes start at this time        
             starting_notes = []
-            for start, end, pitches in note_events:
-                if start == time:
-                    starting_notes.extend(pitches)
-                    active_notes.update({p % 12 for p in pitches})
-                    active_pitches.update(pitches)
+            for pitches, pc_mask in events_starting_at.get(time, ()):
+                starting_notes.extend(pitches)
+                active_notes |= pc_mask
+                active_pitches.update(pitches)
+                
+                # Add to pedal-sustained notes if pedal is active (sustain ALL notes that sound)
+                if self.pedal_mode != "Off":
+                    pedal_sustained_notes |= pc_mask
+                    pedal_sustained_pitches.update(pitches)
                     
-                    # Add to pedal-sustained notes if pedal is active (sustain ALL notes that sound)
-                    if self.pedal_mode != "Off":
-                        pedal_sustained_notes.update({p % 12 for p in pitches})
-                        pedal_sustained_pitches.update(pitches)
-                        
-                        # For auto mode, also update the pitch collection
-                        if self.pedal_mode == "Auto":
-                            auto_pedal_collection.update({p % 12 for p in pitches})
+                    # For auto mode, also update the pitch collection
+                    if self.pedal_mode == "Auto":
+                        auto_pedal_collection |= pc_mask
             
             # Also add any currently active notes to pedal sustain (notes that were already sounding)
             if self.pedal_mode != "Off" and active_notes:
-                pedal_sustained_notes.update(active_notes)
+                pedal_sustained_notes |= active_notes
                 pedal_sustained_pitches.update(active_pitches)
 
             # Combine active notes with pedal-sustained notes for chord detection
-            test_notes = set(active_notes) | pedal_sustained_notes
-            test_pitches = set(active_pitches) | pedal_sustained_pitches
+            test_mask = active_notes | pedal_sustained_notes
+            test_pitches = active_pitches | pedal_sustained_pitches
             
             if self.include_anacrusis:
                 anacrusis_added = []
-                for s_start, s_end, s_pitch in single_notes:
+                for s_start, s_end, s_pitch in singles_ending_at.get(time, ()):
                     # Only include anacrusis notes that were struck as single pitches in isolation
                     # and end exactly when the current chord analysis point occurs
                     # (single_notes already ensures the note was struck alone, not as part of a chord)
-                    if s_end == time and (s_pitch % 12) not in test_notes:
-                        test_notes.add(s_pitch % 12)
+                    pc_bit = 1 << (s_pitch % 12)
+                    if not test_mask & pc_bit:
+                        test_mask |= pc_bit
                         test_pitches.add(s_pitch)
                         anacrusis_added.append(s_pitch)
 
-            if len(test_notes) >= 3:
+            if mask_size(test_mask) >= 3:
+                test_notes = mask_to_pitch_classes(test_mask)
                 # Check for chord formation with sufficient note count
-                bar, beat, ts = offset_to_bar_beat(time)
-                
                 # Analyze note collection for chord detection
-                chords = self.detect_chords(test_notes, debug=False)
+                detect_key = (test_mask, pitch_class_mask(test_pitches))
+                if detect_key == prev_detect_key:
+                    chords = prev_chords
+                else:
+                    chords = self.detect_chords(test_notes, debug=False)
+                    prev_detect_key, prev_chords = detect_key, chords
                 bar, beat, ts = offset_to_bar_beat(time)
                 key = (bar, beat, ts)
                 # Event created; previously had diagnostic printing here which has been removed
+                # Bass is the lowest sounding pitch, whether or not a chord was recognized
+                bass_note = self.semitone_to_note(min(test_pitches) % 12)
                 if chords:
-                    bass_note = self.semitone_to_note(min(test_pitches) % 12)
                     if key not in events:
                         events[key] = {"chords": set(), "basses": set(), "event_notes": set(test_notes)}
 
@@ -1458,7 +1495,6 @@ class MidiChordAnalyzer(tk.Tk):
                     events[key]["event_pitches"] = set(test_pitches)
                 else:
                     # No recognized chord, but 3+ notes: still set bass to lowest pitch
-                    bass_note = self.semitone_to_note(min(test_pitches) % 12)
                     if key not in events:
                         events[key] = {"chords": set(), "basses": set(), "event_notes": set(test_notes), "event_pitches": set(test_pitches)}
                     events[key]["basses"].add(bass_note)
@@ -1468,20 +1504,23 @@ class MidiChordAnalyzer(tk.Tk):
             # Build a list of all single notes (not chords) sorted by onset
             melodic_notes = [elem for elem in flat_notes if isinstance(elem, note.Note)]
             melodic_notes = sorted(melodic_notes, key=lambda n: n.offset)
+            # Per-note data shared by every window: MIDI pitch, and whether the
+            # next note's onset is strictly later than this one's
+            melodic_pitches = [n.pitch.midi for n in melodic_notes]
+            onset_rises = [a.offset < b.offset for a, b in zip(melodic_notes, melodic_notes[1:])]
             
             window_sizes = [3, 4]
             for w in window_sizes:
                 for i in range(len(melodic_notes) - w + 1):
-                    window = melodic_notes[i:i+w]
-                    window_offsets = [n.offset for n in window]
                     # Only consider windows with strictly increasing onsets
-                    if any(window_offsets[j] >= window_offsets[j+1] for j in range(w-1)):
+                    if not all(onset_rises[i:i + w - 1]):
                         continue
-                    window_pitches = [n.pitch.midi for n in window]
+                    window = melodic_notes[i:i+w]
+                    window_pitches = melodic_pitches[i:i + w]
                     window_pcs = {p % 12 for p in window_pitches}
                     if len(window_pcs) < 3:
                         continue
-                    chords = self.detect_chords(window_pcs, debug=True)
+                    chords = self.detect_chords(window_pcs, debug=False)
                     if chords:
                         # Display arpeggio analysis for specified range
                         bar, beat, ts = offset_to_bar_beat(window[0].offset)
@@ -1527,8 +1566,8 @@ class MidiChordAnalyzer(tk.Tk):
                             else:
                                 # check whether any detected chord root is present in block_pcs
                                 for chord_name in chords:
-                                    root = next((n for n in sorted(NOTE_TO_SEMITONE.keys(), key=lambda x: -len(x)) if chord_name.startswith(n)), None)
-                                    if root is not None and (NOTE_TO_SEMITONE.get(root) % 12) in block_pcs:
+                                    root = chord_root(chord_name)
+                                    if root is not None and NOTE_TO_SEMITONE[root] in block_pcs:
                                         accept_arpeggio = True
                                         break
                             if not accept_arpeggio:
@@ -1556,11 +1595,11 @@ class MidiChordAnalyzer(tk.Tk):
         if getattr(self, 'neighbour_notes_searching', False):
             # Group all note events by bar for boundary respect
             notes_by_bar = {}
-            for st, en, prs in note_events:
+            for (st, en, _), pc_mask in zip(note_events, note_masks):
                 bar, _, _ = offset_to_bar_beat(st)
                 if bar not in notes_by_bar:
                     notes_by_bar[bar] = []
-                notes_by_bar[bar].append((st, en, prs))
+                notes_by_bar[bar].append((st, en, pc_mask))
             
             # Track events to merge - store as {early_key: [later_keys_to_merge]}
             events_to_bind = {}
@@ -1569,64 +1608,67 @@ class MidiChordAnalyzer(tk.Tk):
             for bar_num, bar_notes in notes_by_bar.items():
                 # Sort all note events by start time
                 bar_notes.sort(key=lambda x: x[0])
+                bar_starts = [st for st, _, _ in bar_notes]
+                bar_masks = [pc_mask for _, _, pc_mask in bar_notes]
                 
                 # Track state changes: collect all unique time points where notes start or end
                 time_points = set()
-                for st, en, prs in bar_notes:
+                for st, en, _ in bar_notes:
                     time_points.add(st)
                     time_points.add(en)
                 time_points = sorted(time_points)
                 
+                # Pitch-class mask of the notes sounding at each time point, computed once per
+                # point; only notes struck by then (a prefix of bar_notes) can be sounding
+                states = []
+                for t in time_points:
+                    state = 0
+                    for j in range(bisect_right(bar_starts, t)):
+                        if t < bar_notes[j][1]:
+                            state |= bar_masks[j]
+                    states.append(state)
+                
                 # Analyze state at each time point
                 for i in range(len(time_points) - 1):
                     current_time = time_points[i]
                     next_time = time_points[i + 1]
                     
-                    # Find all notes sounding at current_time
-                    current_state = set()
-                    for st, en, prs in bar_notes:
-                        if st <= current_time < en:
-                            current_state.update({p % 12 for p in prs})
-                    
-                    # Find all notes sounding at next_time
-                    next_state = set()
-                    for st, en, prs in bar_notes:
-                        if st <= next_time < en:
-                            next_state.update({p % 12 for p in prs})
+                    # Notes sounding at current_time and at next_time
+                    current_state = states[i]
+                    next_state = states[i + 1]
                     
                     # Check if we have exactly one note changing
-                    if len(current_state) >= 3 and len(next_state) >= 3:
-                        added = next_state - current_state
-                        removed = current_state - next_state
+                    if mask_size(current_state) >= 3 and mask_size(next_state) >= 3:
+                        added = next_state & ~current_state
+                        removed = current_state & ~next_state
                         retained = current_state & next_state
                         
                         # Exactly one note change: one added, one removed, 2+ retained
-                        if len(added) == 1 and len(removed) == 1 and len(retained) >= 2:
-                            old_note = list(removed)[0]
-                            new_note = list(added)[0]
+                        if mask_size(added) == 1 and mask_size(removed) == 1 and mask_size(retained) >= 2:
+                            old_note = removed.bit_length() - 1
+                            new_note = added.bit_length() - 1
                             
                             # Evaluate chord formation with note substitution
-                            test_pcs = {old_note, new_note} | retained
+                            test_pcs = {old_note, new_note} | mask_to_pitch_classes(retained)
                             
                             # Look for passing notes within the duration of retained notes that might complete better chords
                             # Find the time span during which the retained notes are sounding
                             retained_start = current_time
                             retained_end = next_time
-                            for st, en, prs in bar_notes:
-                                if st <= current_time < en:
-                                    pitch_classes = {p % 12 for p in prs}
-                                    if pitch_classes & retained:  # If this contributes to retained notes
-                                        retained_end = max(retained_end, en)
+                            for j in range(bisect_right(bar_starts, current_time)):
+                                en = bar_notes[j][1]
+                                if current_time < en and bar_masks[j] & retained:  # If this contributes to retained notes
+                                    retained_end = max(retained_end, en)
                             
                             # Look for any notes that sound during the retained note period
-                            passing_pcs = set()
-                            for st, en, prs in bar_notes:
+                            passing_mask = 0
+                            for (st, en, _), pc_mask in zip(bar_notes, bar_masks):
                                 # Include notes that start and end within the retained note duration
                                 if retained_start <= st < retained_end and retained_start < en <= retained_end:
-                                    passing_pcs.update({p % 12 for p in prs})
+                                    passing_mask |= pc_mask
                             
                             # Include passing notes for enhanced chord analysis
-                            enhanced_test_pcs = test_pcs | passing_pcs
+                            enhanced_test_pcs = test_pcs | mask_to_pitch_classes(passing_mask)
                             
                             if len(enhanced_test_pcs) >= 4:  # Need at least 4 notes for seventh chord
                                 # Try both versions and prefer the enhanced one if it produces better chords
@@ -1668,16 +1710,10 @@ class MidiChordAnalyzer(tk.Tk):
                         if completion_key in events:
                             # Merge the completion event into the foundation event
                             completion_event = events[completion_key]
-                            if foundation_key[0] == 3 and foundation_key[1] == 1:
-                                print(f"DEBUG NEIGHBOR MERGE: Merging completion {completion_key} -> foundation {foundation_key}")
-                                print(f"  Before: foundation chords = {events[foundation_key].get('chords', set())}")
-                                print(f"  Adding: completion chords = {completion_event.get('chords', set())}")
                             events[foundation_key]["chords"].update(completion_event.get("chords", set()))
                             events[foundation_key]["basses"].update(completion_event.get("basses", set()))
                             events[foundation_key]["event_notes"].update(completion_event.get("event_notes", set()))
                             events[foundation_key]["event_pitches"] = events[foundation_key].get("event_pitches", set()) | completion_event.get("event_pitches", set())
-                            if foundation_key[0] == 3 and foundation_key[1] == 1:
-                                print(f"  After: foundation chords = {events[foundation_key].get('chords', set())}")
                             
                             # Remove the completion event since it's now merged
                             del events[completion_key]
@@ -1691,61 +1727,12 @@ class MidiChordAnalyzer(tk.Tk):
         Time-segment based analysis: divide music into regular time segments
         and analyze all pitches active during each segment.
         """
-        flat_notes = list(score.flatten().getElementsByClass([note.Note, m21chord.Chord]))
+        # Notes/chords and time signatures for bar/beat calculation, in one pass
+        flat_notes, time_signatures = self._extract_notes_and_time_signatures(score)
 
-        # Extract time signatures for bar/beat calculation
-        time_signatures = []
-        for ts in score.flatten().getElementsByClass(meter.TimeSignature):
-            offset = float(ts.offset)
-            time_signatures.append((offset, int(ts.numerator), int(ts.denominator)))
+        get_time_signature = self._make_time_signature_lookup(time_signatures)
 
-        time_signatures.sort(key=lambda x: x[0])
-
-        # Ensure we have at least one time signature
-        if not time_signatures:
-            time_signatures = [(0.0, 4, 4)]
-        elif time_signatures[0][0] > 0.0:
-            first_num, first_den = time_signatures[0][1], time_signatures[0][2]
-            time_signatures.insert(0, (0.0, first_num, first_den))
-
-        def get_time_signature(offset):
-            ts = (4, 4)
-            for t_off, n, d in time_signatures:
-                if offset >= t_off:
-                    ts = (n, d)
-                else:
-                    break
-            return ts
-
-        def offset_to_bar_beat(offset):
-            if not time_signatures:
-                num, denom = 4, 4
-                return 1, int(offset) + 1, f"{num}/{denom}"
-
-            bars_before = 0
-            for i, (t_off, num, denom) in enumerate(time_signatures):
-                next_off = time_signatures[i + 1][0] if i + 1 < len(time_signatures) else None
-                beat_len = 4.0 / denom
-
-                if next_off is None or offset < next_off:
-                    beats_since_t = (offset - t_off) / beat_len
-                    if beats_since_t < 0:
-                        beats_since_t = (offset) / beat_len
-                        bars = int(beats_since_t // num)
-                        beat = int(beats_since_t % num) + 1
-                        return bars + 1, beat, f"{num}/{denom}"
-                    bar_in_segment = int(beats_since_t // num)
-                    beat = int(beats_since_t % num) + 1
-                    return bars_before + bar_in_segment + 1, beat, f"{num}/{denom}"
-                else:
-                    segment_beats = (next_off - t_off) / beat_len
-                    bars_in_segment = int(segment_beats // num)
-                    bars_before += bars_in_segment
-
-            num, denom = time_signatures[-1][1], time_signatures[-1][2]
-            beat_len = 4.0 / denom
-            beats = offset / beat_len
-            return int(beats // num) + 1, int(beats % num) + 1, f"{num}/{denom}"
+        offset_to_bar_beat = self._make_offset_to_bar_beat(time_signatures)
 
         # Build note events list
         note_events = []
@@ -1763,15 +1750,25 @@ class MidiChordAnalyzer(tk.Tk):
         segments = self._calculate_segment_boundaries(score, time_signatures, offset_to_bar_beat)
         
         events = {}
+
+        # Segments run forward in time, so sweep the notes alongside them: a note joins
+        # `sounding` once it starts before the segment ends and leaves it once it has
+        # ended by the segment start (each note is added and dropped once)
+        note_events.sort(key=lambda e: e[0])
+        next_note = 0
+        sounding = []
         
         # Process each segment
         for start_offset, end_offset, bar, beat, ts in segments:
-            # Collect all pitches active during this segment
+            while next_note < len(note_events) and note_events[next_note][0] < end_offset:
+                sounding.append(note_events[next_note])
+                next_note += 1
+            sounding = [e for e in sounding if e[1] > start_offset]
+
+            # Collect all pitches active during this segment (every note in `sounding` overlaps it)
             active_pitches = set()
-            for note_start, note_end, pitches in note_events:
-                # Check if note overlaps with segment
-                if note_start < end_offset and note_end > start_offset:
-                    active_pitches.update(pitches)
+            for _, _, pitches in sounding:
+                active_pitches.update(pitches)
             
             if len(active_pitches) >= 3:  # Need at least 3 notes for chord detection
                 active_pcs = {p % 12 for p in active_pitches}
@@ -1793,6 +1790,82 @@ class MidiChordAnalyzer(tk.Tk):
 
         return self._process_detected_events(events)
 
+    def _extract_notes_and_time_signatures(self, score):
+        """Collect notes/chords and (offset, num, denom) time signatures from a single walk of the flat score."""
+        flat_notes = []
+        time_signatures = []
+        for elem in score.flatten():
+            if isinstance(elem, (note.Note, m21chord.Chord)):
+                flat_notes.append(elem)
+            elif isinstance(elem, meter.TimeSignature):
+                time_signatures.append((float(elem.offset), int(elem.numerator), int(elem.denominator)))
+
+        time_signatures.sort(key=lambda x: x[0])
+
+        # Ensure we have at least one time signature
+        if not time_signatures:
+            time_signatures = [(0.0, 4, 4)]
+        elif time_signatures[0][0] > 0.0:
+            first_num, first_den = time_signatures[0][1], time_signatures[0][2]
+            time_signatures.insert(0, (0.0, first_num, first_den))
+        return flat_notes, time_signatures
+
+    def _make_time_signature_lookup(self, time_signatures):
+        """Build an offset -> (num, denom) lookup (binary search over the sorted timesig offsets)."""
+        ts_offsets = [t_off for t_off, _, _ in time_signatures]
+        ts_values = [(n, d) for _, n, d in time_signatures]
+
+        def get_time_signature(offset):
+            # Find the last time signature whose offset is <= given offset
+            i = bisect_right(ts_offsets, offset)
+            return ts_values[i - 1] if i else (4, 4)
+
+        return get_time_signature
+
+    def _make_offset_to_bar_beat(self, time_signatures):
+        """
+        Build an offset -> (bar, beat, "num/denom") mapper for the given time signatures.
+
+        Whole bars contributed by each closed timesig segment are accumulated once up
+        front, so each lookup is a binary search instead of a walk over all segments.
+        """
+        if not time_signatures:
+            def offset_to_bar_beat(offset):
+                num, denom = 4, 4
+                return 1, int(offset) + 1, f"{num}/{denom}"
+            return offset_to_bar_beat
+
+        seg_offsets = [t_off for t_off, _, _ in time_signatures]
+        seg_labels = [f"{num}/{denom}" for _, num, denom in time_signatures]
+        seg_bars_before = []
+        bars_before = 0
+        for i, (t_off, num, denom) in enumerate(time_signatures):
+            seg_bars_before.append(bars_before)
+            if i + 1 < len(time_signatures):
+                # full segment contributes whole bars
+                segment_beats = (time_signatures[i + 1][0] - t_off) / (4.0 / denom)
+                bars_before += int(segment_beats // num)
+
+        def offset_to_bar_beat(offset):
+            # Map an absolute offset (in quarter lengths) to bar and beat
+            i = bisect_right(seg_offsets, offset) - 1
+            if i < 0:
+                i = 0
+            t_off, num, denom = time_signatures[i]
+            beat_len = 4.0 / denom  # quarter lengths per beat
+            beats_since_t = (offset - t_off) / beat_len
+            if beats_since_t < 0:
+                # offset before first timesig marker
+                beats_since_t = (offset) / beat_len
+                bars = int(beats_since_t // num)
+                beat = int(beats_since_t % num) + 1
+                return bars + 1, beat, seg_labels[i]
+            bar_in_segment = int(beats_since_t // num)
+            beat = int(beats_since_t % num) + 1
+            return seg_bars_before[i] + bar_in_segment + 1, beat, seg_labels[i]
+
+        return offset_to_bar_beat
+
     def _calculate_segment_boundaries(self, score, time_signatures, offset_to_bar_beat):
         """Calculate time segment boundaries based on selected segment size."""
         segments = []
@@ -1805,10 +1878,11 @@ class MidiChordAnalyzer(tk.Tk):
         total_duration = max(elem.offset + elem.quarterLength for elem in flat_notes)
         
         current_offset = 0.0
+        get_time_signature = self._make_time_signature_lookup(time_signatures)
         
         while current_offset < total_duration:
             # Calculate segment duration based on current time signature and segment size
-            num, denom = self._get_time_signature_at_offset(current_offset, time_signatures)
+            num, denom = get_time_signature(current_offset)
             beat_length = 4.0 / denom  # quarter note lengths per beat
             
             if self.segment_size == "half_beats":
@@ -1828,15 +1902,8 @@ class MidiChordAnalyzer(tk.Tk):
             
         return segments
 
-    def _get_time_signature_at_offset(self, offset, time_signatures):
-        """Helper function to get time signature at a given offset."""
-        ts = (4, 4)
-        for t_off, n, d in time_signatures:
-            if offset >= t_off:
-                ts = (n, d)
-            else:
-                break
-        return ts
+    # (base chord, root pitch class) -> (chord-tone mask, mask of pitch classes inside the stack)
+    _CLEAN_STACK_MASKS: Dict[Tuple[str, int], Tuple[int, int]] = {}
 
     def _is_clean_stack(self, chord_name: str, event_notes: set[int]) -> bool:
         """
@@ -1844,7 +1911,7 @@ class MidiChordAnalyzer(tk.Tk):
         chord_name: e.g. "C7", "Gm", etc.
         event_notes: set of MIDI pitch classes (0=C, 1=C#, ..., 11=B) present at this event.
         """
-        root = next((note for note in sorted(NOTE_TO_SEMITONE.keys(), key=lambda x: -len(x)) if chord_name.startswith(note)), None)
+        root = chord_root(chord_name)
         if not root:
             return False
         base_chord = chord_name.replace(root, 'C')
@@ -1852,40 +1919,34 @@ class MidiChordAnalyzer(tk.Tk):
             return False
 
         root_pc = NOTE_TO_SEMITONE[root]
-        expected_pcs = set((root_pc + i) % 12 for i in CHORDS[base_chord])
-        event_notes = set(event_notes)
+        masks = self._CLEAN_STACK_MASKS.get((base_chord, root_pc))
+        if masks is None:
+            expected_mask = pitch_class_mask(root_pc + i for i in CHORDS[base_chord])
+            # Find lowest and highest chord tones; extras strictly between them break the stack
+            min_tone = (expected_mask & -expected_mask).bit_length() - 1
+            max_tone = expected_mask.bit_length() - 1
+            if min_tone < max_tone:
+                # Handle wrap-around (e.g., C-E-G, extra note B)
+                gap_mask = (1 << max_tone) - (1 << (min_tone + 1))
+            else:
+                # Single chord tone: every extra note counts as inside the stack
+                gap_mask = 0xFFF & ~expected_mask
+            masks = self._CLEAN_STACK_MASKS[(base_chord, root_pc)] = (expected_mask, gap_mask)
+        expected_mask, gap_mask = masks
+        event_mask = pitch_class_mask(event_notes)
 
         # Must contain all required chord notes
-        if not expected_pcs.issubset(event_notes):
+        if expected_mask & event_mask != expected_mask:
             return False
 
-        # If no extra notes, it's clean
-        if event_notes == expected_pcs:
-            return True
-
-        # Find lowest and highest chord tones in the event
-        chord_tones_sorted = sorted(expected_pcs)
-        min_tone = chord_tones_sorted[0]
-        max_tone = chord_tones_sorted[-1]
-
-        # Check for extra notes that fall strictly between min and max chord tones
-        for n in event_notes - expected_pcs:
-            # Handle wrap-around (e.g., C-E-G, extra note B)
-            if min_tone < max_tone:
-                if min_tone < n < max_tone:
-                    return False
-            else:
-                # e.g., chord tones G (7), C (0), E (4): min=0, max=7, so between is 1-6
-                if (n > min_tone or n < max_tone):
-                    return False
-
-        return True
+        # Clean if no extra notes fall strictly between min and max chord tones
+        return not (event_mask & ~expected_mask & gap_mask)
     
     def _count_root_in_pitches(self, chord_name: str, event_pitches: set[int]) -> int:
         """
         Returns how many times the root of chord_name appears in event_pitches (MIDI note numbers).
         """
-        root = next((note for note in sorted(NOTE_TO_SEMITONE.keys(), key=lambda x: -len(x)) if chord_name.startswith(note)), None)
+        root = chord_root(chord_name)
         if not root:
             return 0
         root_pc = NOTE_TO_SEMITONE[root]
@@ -1902,16 +1963,11 @@ class MidiChordAnalyzer(tk.Tk):
         
 
 
+        # Chord quality -> position in the effective priority list (lower is stronger)
+        priority_rank = {name: i for i, name in enumerate(self.get_effective_priority_list())}
+
         def chord_priority(chord_name: str) -> int:
-            base = chord_name
-            for n in sorted(NOTE_TO_SEMITONE.keys(), key=lambda x: -len(x)):
-                if chord_name.startswith(n):
-                    base = chord_name.replace(n, 'C')
-                    break
-            # Remove the 'C' prefix to get the chord quality
-            chord_quality = base[1:] if base.startswith('C') else base
-            priority_list = self.get_effective_priority_list()
-            return priority_list.index(chord_quality) if chord_quality in priority_list else 999
+            return priority_rank.get(chord_quality(chord_name), 999)
 
         def dedupe_chords_by_priority(chords_dict: Dict[str, Any]) -> Dict[str, str]:
             result = {}
@@ -1930,23 +1986,19 @@ class MidiChordAnalyzer(tk.Tk):
         for (bar, beat, ts), data in event_items:
             chords = data.get("chords", set())
             basses = data.get("basses", set())
-            event_notes_set = set(data.get("event_notes", set()))
-            event_pitches_set = set(data.get("event_pitches", set()))
+            # The raw event sets are not reused after this call, so they are carried
+            # through without defensive copies (merges below build or copy their own sets)
+            event_notes_set = data.get("event_notes", set())
+            event_pitches_set = data.get("event_pitches", set())
             chords_by_root: Dict[str, Any] = {}
             for chord in chords:
-                root = next((n for n in sorted(NOTE_TO_SEMITONE.keys(), key=lambda x: -len(x)) if chord.startswith(n)), None)
+                root = chord_root(chord)
                 if not root:
                     continue
-                base_chord = chord.replace(root, 'C')
-                # Extract chord quality (remove 'C' prefix)
-                chord_quality = base_chord[1:] if base_chord.startswith('C') else base_chord
-                priority_list = self.get_effective_priority_list()
-                current_priority = priority_list.index(chord_quality) if chord_quality in priority_list else 999
+                current_priority = priority_rank.get(chord_quality(chord), 999)
                 prev_chord = chords_by_root.get(root)
                 if prev_chord:
-                    prev_base = prev_chord.replace(root, 'C')
-                    prev_quality = prev_base[1:] if prev_base.startswith('C') else prev_base
-                    prev_priority = priority_list.index(prev_quality) if prev_quality in priority_list else 999
+                    prev_priority = priority_rank.get(chord_quality(prev_chord), 999)
                     if current_priority < prev_priority:
                         chords_by_root[root] = chord
                 else:
@@ -1983,33 +2035,29 @@ class MidiChordAnalyzer(tk.Tk):
         # Now collapse strictly identical consecutive chord-sets by unioning basses
         # Skip this collapsing for time-segment analysis to maintain segment independence
         if getattr(self, 'analysis_mode', 'event') == 'event':
-            final_filtered_events: List[Tuple[Tuple[int,int,str], Dict[str, Any], Any]] = []
+            final_filtered_events: List[Any] = []
             prev_chords_set = None
-            prev_bass_set = set()
-            prev_event = None
 
+            # Entries are [key, chords_by_root, basses, notes, pitches] lists. The first time an
+            # entry absorbs a later identical event its collections are copied into fresh sets,
+            # and every further identical event is unioned into those sets in place
+            prev_is_merged = False
             for event in processed_events:
                 chords_set = set(event[1].values())
-                bass_set = set(event[2])
-                notes_set = set(event[3])
-                pitches_set = set(event[4])
                 if chords_set and prev_chords_set and chords_set == prev_chords_set:
-                    combined_bass = prev_bass_set | bass_set
-                    combined_notes = prev_notes_set | notes_set
-                    combined_pitches = prev_pitches_set | pitches_set
                     # keep the original key but update chords and basses and note/pitch unions
-                    prev_event = (prev_event[0], event[1], combined_bass, combined_notes, combined_pitches)
-                    final_filtered_events[-1] = prev_event
-                    prev_bass_set = combined_bass
-                    prev_notes_set = combined_notes
-                    prev_pitches_set = combined_pitches
+                    prev_event = final_filtered_events[-1]
+                    if not prev_is_merged:
+                        prev_event[2:5] = [set(prev_event[2]), set(prev_event[3]), set(prev_event[4])]
+                        prev_is_merged = True
+                    prev_event[1] = event[1]
+                    prev_event[2].update(event[2])
+                    prev_event[3].update(event[3])
+                    prev_event[4].update(event[4])
                 else:
-                    prev_event = event
-                    final_filtered_events.append(event)
+                    final_filtered_events.append(list(event))
                     prev_chords_set = chords_set
-                    prev_bass_set = bass_set
-                    prev_notes_set = notes_set
-                    prev_pitches_set = pitches_set
+                    prev_is_merged = False
         else:
             # For time-segment mode: keep all events as-is without any collapsing
             final_filtered_events: List[Tuple[Tuple[int,int,str], Dict[str, Any], Any]] = []
@@ -2072,14 +2120,11 @@ class MidiChordAnalyzer(tk.Tk):
                                 candidates.append(ev[1][root])
                         if candidates:
                             merged_chords[root] = min(candidates, key=chord_priority)
-                    merged_basses = set(prev[2]) | set(ev[2])
+                    merged_basses = set(prev[2]).union(ev[2])
                     # union event notes and pitches to avoid losing pitch data during merge
-                    prev_notes = set(prev[3]) if len(prev) > 3 else set()
-                    prev_pitches = set(prev[4]) if len(prev) > 4 else set()
-                    cur_notes = set(ev[3]) if len(ev) > 3 else set()
-                    cur_pitches = set(ev[4]) if len(ev) > 4 else set()
-                    merged_notes = prev_notes | cur_notes
-                    merged_pitches = prev_pitches | cur_pitches
+                    # (every entry is a 5-field (key, chords, basses, notes, pitches) record)
+                    merged_notes = set(prev[3]).union(ev[3])
+                    merged_pitches = set(prev[4]).union(ev[4])
                     merged[-1] = (prev[0], merged_chords, merged_basses, merged_notes, merged_pitches)
                 else:
                     merged.append(ev)
@@ -2087,14 +2132,13 @@ class MidiChordAnalyzer(tk.Tk):
 
         output_lines: List[str] = []
         filtered_events: Dict[Tuple[int,int,str], Dict[str, Any]] = {}
+        semitone_of = NOTE_TO_SEMITONE.get  # bound once for the per-bass sort key
         for (bar, beat, ts), chords_by_root, basses, event_notes, event_pitches in final_filtered_events:
             deduped_chords_by_root = dedupe_chords_by_priority(chords_by_root)
             chords_sorted = sorted(deduped_chords_by_root.values())
-            bass_sorted = sorted(basses, key=lambda b: NOTE_TO_SEMITONE.get(b, 99))
+            bass_sorted = sorted(basses, key=lambda b: semitone_of(b, 99))
             bass_string = " + ".join(beautify_chord(b) for b in bass_sorted)
             # Use the unioned event_notes and event_pitches carried through merges
-            event_notes = set(event_notes or [])
-            event_pitches = set(event_pitches or [])
             chord_info: Dict[str, Dict[str, Any]] = {}
             for chord in chords_sorted:
                 chord_info[chord] = {
@@ -2103,6 +2147,7 @@ class MidiChordAnalyzer(tk.Tk):
                 }
             filtered_events[(bar, beat, ts)] = {
                 "chords": set(chords_sorted),
+                "sorted_chords": tuple(chords_sorted),  # display order, sorted once here
                 "basses": bass_sorted,
                 "chord_info": chord_info
             }
@@ -2120,89 +2165,93 @@ class MidiChordAnalyzer(tk.Tk):
 
         chords_found = []
         semitone_list = sorted(set(semitones))
+        pcs_mask = pitch_class_mask(semitones)
+
+        # Also collect basses and event pitches if available
+        # Try to get the full set of event pitches and basses from the calling context
+        # If not available, fallback to semitones only
+        event_pitches = set()
+        event_basses = set()
+        # Try to get from the caller if possible
+        import inspect
+        frame = inspect.currentframe()
+        try:
+            outer_locals = frame.f_back.f_locals
+            event_pitches = set(outer_locals.get('test_pitches', []))
+            event_basses = set(outer_locals.get('basses', []))
+        except Exception:
+            pass
+        finally:
+            del frame
+
+        # Pitch classes that rule out a 'no3' chord when they supply its third:
+        # the semitones themselves, the event pitches and the event basses
+        third_mask = (
+            pcs_mask
+            | pitch_class_mask(event_pitches)
+            | pitch_class_mask(NOTE_TO_SEMITONE[self.semitone_to_note(b)] for b in event_basses)
+        )
+
+        # The result only depends on these masks and the chord settings, so repeated
+        # pitch-class collections (very common across time points) are answered from a cache
+        priority_list = self.get_effective_priority_list()
+        cache = getattr(self, '_chord_cache', None)
+        if cache is None:
+            cache = self._chord_cache = {}
+        cache_key = (pcs_mask, third_mask, self.include_triads, tuple(priority_list))
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        # Enabled chord patterns in priority order, filtered once per call rather than per root
+        candidates = []
+        for name in priority_list:
+            # Convert chord quality back to full chord name for CHORDS lookup
+            full_name = 'C' + name
+            if full_name in TRIADS and not self.include_triads:
+                continue
+            if full_name not in CHORDS:
+                continue
+            candidates.append((name, full_name, CHORD_MASKS_BY_ROOT[full_name]))
+        noroot_candidates = [(full_name, patterns) for name, full_name, patterns in candidates if "noroot" in name]
 
         # First pass: try candidate roots that are present in the set
         for root in sorted(set(semitones)):
-            normalized = {(n - root) % 12 for n in semitones}
-            # Also collect basses and event pitches if available
-            # Try to get the full set of event pitches and basses from the calling context
-            # If not available, fallback to semitones only
-            event_pitches = set()
-            event_basses = set()
-            # Try to get from the caller if possible
-            import inspect
-            frame = inspect.currentframe()
-            try:
-                outer_locals = frame.f_back.f_locals
-                event_pitches = set(outer_locals.get('test_pitches', []))
-                event_basses = set(outer_locals.get('basses', []))
-            except Exception:
-                pass
-            finally:
-                del frame
-
-            for name in self.get_effective_priority_list():
-                # Convert chord quality back to full chord name for CHORDS lookup
-                full_name = 'C' + name
-                if full_name in TRIADS and not self.include_triads:
-                    continue
-                if full_name not in CHORDS:
-                    continue
-                chord_pattern = set(CHORDS[full_name])
+            for name, full_name, patterns in candidates:
+                chord_pattern = patterns[root]
                 # Special handling for 'no3' chords: only match if third is truly absent
                 if "no3" in name:
                     third_major = (root + 4) % 12
                     third_minor = (root + 3) % 12
-                    third_present = False
-                    # Check in semitones
-                    if third_major in semitones or third_minor in semitones:
-                        third_present = True
-                    # Check in event_pitches
-                    if any((p % 12 == third_major or p % 12 == third_minor) for p in event_pitches):
-                        third_present = True
-                    # Check in event_basses
-                    if any((self.semitone_to_note(b) == self.semitone_to_note(third_major) or self.semitone_to_note(b) == self.semitone_to_note(third_minor)) for b in event_basses):
-                        third_present = True
+                    third_present = bool(third_mask & ((1 << third_major) | (1 << third_minor)))
                     if third_present:
                         continue  # Third is present, skip 'no3' chord
-                    if chord_pattern.issubset(normalized):
+                    if pcs_mask & chord_pattern == chord_pattern:
                         matched = full_name.replace('C', self.semitone_to_note(root))
                         chords_found.append(matched)
                         break
                 else:
-                    if chord_pattern.issubset(normalized):
+                    if pcs_mask & chord_pattern == chord_pattern:
                         matched = full_name.replace('C', self.semitone_to_note(root))
                         chords_found.append(matched)
                         break
 
         # Second pass: try "noroot" style chords where the root pitch-class is absent
-        for root in sorted(set(range(12)) - set(semitones)):
-            normalized = {(n - root) % 12 for n in semitones}
-            for name in self.get_effective_priority_list():
-                if "noroot" not in name:
-                    continue
-                # Convert chord quality back to full chord name for CHORDS lookup
-                full_name = 'C' + name
-                if full_name in TRIADS and not self.include_triads:
-                    continue
-                if full_name not in CHORDS:
-                    continue
-                chord_pattern = set(CHORDS[full_name])
-                if chord_pattern == normalized:
+        for root in range(12):
+            if pcs_mask >> root & 1:
+                continue
+            for full_name, patterns in noroot_candidates:
+                if patterns[root] == pcs_mask:
                     matched = full_name.replace('C', self.semitone_to_note(root))
                     chords_found.append(matched)
                     break
 
+        cache[cache_key] = tuple(chords_found)
         return chords_found
 
     def semitone_to_note(self, semitone):
         """Convert semitone number to note name, preferring natural notes."""
-        # First try natural notes (single character)
-        for note in NOTE_TO_SEMITONE:
-            if NOTE_TO_SEMITONE[note] == semitone and len(note) == 1:
-                return note
-        # Fallback to any matching note
-        return next((note for note, val in NOTE_TO_SEMITONE.items() if val == semitone), "C")
+        return SEMITONE_TO_NOTE.get(semitone, "C")
         
     def save_analysis_txt(self):
         if not self.analyzed_events:
@@ -2217,25 +2266,16 @@ class MidiChordAnalyzer(tk.Tk):
             return
 
         try:
+            lines = []
+            for (bar, beat, ts), data in sorted(self.analyzed_events.items()):
+                chord_info = data.get("chord_info", {})
+                chords_str = ",".join(f"{chord}{chord_marker(chord_info.get(chord, {}))}" for chord in sorted(data["chords"]))
+                bass = "+".join(data["basses"])
+                lines.append(f"{bar}|{beat}|{ts}|{chords_str}|{bass}\n")
+            # Add legend at the end of the file
+            lines.append(f"\nLegend: {CLEAN_STACK_SYMBOL}=Clean stack, {ROOT2_SYMBOL}=Root doubled, {ROOT3_SYMBOL}=Root tripled or more\n")
             with open(file_path, "w", encoding="utf-8") as f:
-                for (bar, beat, ts), data in sorted(self.analyzed_events.items()):
-                    chord_info = data.get("chord_info", {})
-                    chords = []
-                    for chord in sorted(data["chords"]):
-                        marker = ""
-                        if chord_info.get(chord, {}).get("clean_stack"):
-                            marker += CLEAN_STACK_SYMBOL
-                        root_count = chord_info.get(chord, {}).get("root_count", 1)
-                        if root_count == 2:
-                            marker += ROOT2_SYMBOL
-                        elif root_count >= 3:
-                            marker += ROOT3_SYMBOL
-                        chords.append(f"{chord}{marker}")
-                    chords_str = ",".join(chords)
-                    bass = "+".join(data["basses"])
-                    f.write(f"{bar}|{beat}|{ts}|{chords_str}|{bass}\n")
-                # Add legend at the end of the file
-                f.write(f"\nLegend: {CLEAN_STACK_SYMBOL}=Clean stack, {ROOT2_SYMBOL}=Root doubled, {ROOT3_SYMBOL}=Root tripled or more\n")
+                f.write("".join(lines))
             tk.messagebox.showinfo("Saved", f"Analysis saved to {file_path}")
         except Exception as e:
             tk.messagebox.showerror("Error", f"Failed to save analysis:\n{e}")
@@ -2315,14 +2355,11 @@ class MidiChordAnalyzer(tk.Tk):
         
         # Use the dynamic priority list from GUI settings for chord deduplication
 
+        # Chord quality -> position in the effective priority list (lower is stronger)
+        priority_rank = {name: i for i, name in enumerate(self.get_effective_priority_list())}
+
         def chord_priority(chord_name: str) -> int:
-            base = chord_name
-            for root in sorted(NOTE_TO_SEMITONE.keys(), key=lambda x: -len(x)):
-                if chord_name.startswith(root):
-                    base = chord_name[len(root):]
-                    break
-            priority_list = self.get_effective_priority_list()
-            return priority_list.index(base) if base in priority_list else 999
+            return priority_rank.get(chord_quality(chord_name), 999)
 
         event_items = sorted(events.items())
         processed_events: List[Tuple[Tuple[int,int,str], Dict[str, Any], Any, Set[int], Set[int]]] = []
@@ -2335,19 +2372,13 @@ class MidiChordAnalyzer(tk.Tk):
             event_pitches_set = set(data.get("event_pitches", set()))
             chords_by_root: Dict[str, Any] = {}
             for chord in chords:
-                root = next((n for n in sorted(NOTE_TO_SEMITONE.keys(), key=lambda x: -len(x)) if chord.startswith(n)), None)
+                root = chord_root(chord)
                 if not root:
                     continue
-                base_chord = chord.replace(root, 'C')
-                # Extract chord quality (remove 'C' prefix)
-                chord_quality = base_chord[1:] if base_chord.startswith('C') else base_chord
-                priority_list = self.get_effective_priority_list()
-                current_priority = priority_list.index(chord_quality) if chord_quality in priority_list else 999
+                current_priority = priority_rank.get(chord_quality(chord), 999)
                 prev_chord = chords_by_root.get(root)
                 if prev_chord:
-                    prev_base = prev_chord.replace(root, 'C')
-                    prev_quality = prev_base[1:] if prev_base.startswith('C') else prev_base
-                    prev_priority = priority_list.index(prev_quality) if prev_quality in priority_list else 999
+                    prev_priority = priority_rank.get(chord_quality(prev_chord), 999)
                     if current_priority < prev_priority:
                         chords_by_root[root] = chord
                 else:
@@ -2367,35 +2398,29 @@ class MidiChordAnalyzer(tk.Tk):
             i += 1
 
         # Now collapse strictly identical consecutive chord-sets by unioning basses
-        final_filtered_events: List[Tuple[Tuple[int,int,str], Dict[str, Any], Any, Set[int], Set[int]]] = []
+        final_filtered_events: List[Any] = []
         prev_chords_set = None
-        prev_bass_set = set()
-        prev_notes_set = set()
-        prev_pitches_set = set()
-        prev_event = None
 
+        # Entries are [key, chords_by_root, basses, notes, pitches] lists. The first time an
+        # entry absorbs a later identical event its collections are copied into fresh sets,
+        # and every further identical event is unioned into those sets in place
+        prev_is_merged = False
         for event in processed_events:
             chords_set = set(event[1].values())
-            bass_set = set(event[2])
-            notes_set = set(event[3])
-            pitches_set = set(event[4])
             if chords_set and prev_chords_set and chords_set == prev_chords_set:
-                combined_bass = prev_bass_set | bass_set
-                combined_notes = prev_notes_set | notes_set
-                combined_pitches = prev_pitches_set | pitches_set
                 # keep the original key but update chords and basses and note/pitch unions
-                prev_event = (prev_event[0], event[1], combined_bass, combined_notes, combined_pitches)
-                final_filtered_events[-1] = prev_event
-                prev_bass_set = combined_bass
-                prev_notes_set = combined_notes
-                prev_pitches_set = combined_pitches
+                prev_event = final_filtered_events[-1]
+                if not prev_is_merged:
+                    prev_event[2:5] = [set(prev_event[2]), set(prev_event[3]), set(prev_event[4])]
+                    prev_is_merged = True
+                prev_event[1] = event[1]
+                prev_event[2].update(event[2])
+                prev_event[3].update(event[3])
+                prev_event[4].update(event[4])
             else:
-                prev_event = event
-                final_filtered_events.append(event)
+                final_filtered_events.append(list(event))
                 prev_chords_set = chords_set
-                prev_bass_set = bass_set
-                prev_notes_set = notes_set
-                prev_pitches_set = pitches_set
+                prev_is_merged = False
 
         # Convert back to the original events format
         deduplicated_events = {}
@@ -2496,11 +2521,19 @@ class EmbeddedMidiKeyboard:
             self.midi_out = None
             self.active_notes = {}
 
+        # Bound note_on/note_off of the MIDI output (None when there is none), used per note
+        self._midi_note_on = self.midi_out.note_on if self.midi_out else None
+        self._midi_note_off = self.midi_out.note_off if self.midi_out else None
+
         # Minimal constants
         WHITE_KEYS = ['C', 'D', 'E', 'F', 'G', 'A', 'B']
         BLACK_KEYS = ['C#\nDb', 'D#\nEb', '', 'F#\nGb', 'G#\nAb', 'A#\nBb', '']
 
         self.selected_notes = set()
+        self._analysis_pending = False  # analyze_chord already scheduled by _schedule_analysis
+        # (is_note_on, pitch class) pairs queued by the MIDI listener thread, applied by _drain_midi
+        self._midi_events = deque()
+        self._midi_drain_running = False
         self.include_triads_var = tk.BooleanVar(value=True)
 
         # Build a simple layout on the parent (dark background)
@@ -2517,6 +2550,10 @@ class EmbeddedMidiKeyboard:
 
         self.white_keys_rects = []
         self.black_keys_rects = []
+        # note name (both enharmonic spellings for black keys) -> (rectangle id, unselected fill)
+        self._key_rects = {}
+        # rectangle id -> (note name, semitone) reported when the key is clicked
+        self._note_by_rect = {}
 
         for i, note in enumerate(WHITE_KEYS):
             x = self.offset_x + i * self.white_key_width
@@ -2525,6 +2562,8 @@ class EmbeddedMidiKeyboard:
                 fill='white', outline='#555555', width=2, tags=("white_key", note)
             )
             self.white_keys_rects.append(rect)
+            self._key_rects[note] = (rect, 'white')
+            self._note_by_rect[rect] = (note, NOTE_TO_SEMITONE[note])
 
         for i, note in enumerate(BLACK_KEYS):
             if note != '':
@@ -2538,6 +2577,8 @@ class EmbeddedMidiKeyboard:
                 self.canvas.addtag_withtag("black_key", rect)
                 for enh_note in enharmonics:
                     self.canvas.addtag_withtag(enh_note, rect)
+                    self._key_rects[enh_note] = (rect, 'black')
+                self._note_by_rect[rect] = (enharmonics[0], NOTE_TO_SEMITONE[enharmonics[0]])
 
         # Bindings
         self.canvas.tag_bind("white_key", "<Button-1>", self._on_key_click)
@@ -2556,7 +2597,6 @@ class EmbeddedMidiKeyboard:
             self.analyze_chord()  # refresh analysis when toggled
         
         # Platform-friendly triads button - same approach as Clear button
-        import platform
         if platform.system() == "Darwin":  # Mac
             triads_btn_kwargs = {"font": ("Segoe UI", 10), "padx": 12, "pady": 5}
         else:  # PC/Linux
@@ -2651,21 +2691,16 @@ class EmbeddedMidiKeyboard:
         clicked = self.canvas.find_withtag('current')
         if not clicked:
             return
-        clicked_id = clicked[0]
-        tags = self.canvas.gettags(clicked_id)
-        note = next((tag for tag in tags if tag in NOTE_TO_SEMITONE), None)
-        if note is None:
+        key = self._note_by_rect.get(clicked[0])
+        if key is None:
             return
-        semitone = NOTE_TO_SEMITONE[note]
+        note, semitone = key
         if semitone in self.selected_notes:
             self.selected_notes.remove(semitone)
             self._set_key_color(note, False)
             self._stop_note(semitone)
             # Update analysis after mouse-driven removal
-            try:
-                self.analyze_chord()
-            except Exception:
-                pass
+            self._schedule_analysis()
         else:
             if len(self.selected_notes) >= 10:
                 messagebox.showinfo("Limit Reached", "Maximum 10 notes can be selected.")
@@ -2674,43 +2709,28 @@ class EmbeddedMidiKeyboard:
             self._set_key_color(note, True)
             self._play_note(semitone)
             # Update analysis after mouse-driven addition
-            try:
-                self.analyze_chord()
-            except Exception:
-                pass
+            self._schedule_analysis()
 
     def _set_key_color(self, note, selected):
         fluorescent_pink = '#ff00ff'
-        for rect in self.white_keys_rects + self.black_keys_rects:
-            if note in self.canvas.gettags(rect):
-                if selected:
-                    # played notes fluorescent pink
-                    color = fluorescent_pink
-                else:
-                    color = 'white' if note in ['C','D','E','F','G','A','B'] else 'black'
-                self.canvas.itemconfig(rect, fill=color)
-                break
+        key = self._key_rects.get(note)
+        if key is None:
+            return
+        rect, default_fill = key
+        # played notes fluorescent pink
+        self.canvas.itemconfig(rect, fill=fluorescent_pink if selected else default_fill)
 
     def _clear_selection(self):
         for semitone in list(self.selected_notes):
             self._stop_note(semitone)
         self.selected_notes.clear()
-        for rect in self.white_keys_rects + self.black_keys_rects:
-            note_tags = self.canvas.gettags(rect)
-            if any(t in ['C','D','E','F','G','A','B'] for t in note_tags):
-                self.canvas.itemconfig(rect, fill='white')
-            else:
-                self.canvas.itemconfig(rect, fill='black')
+        # Every key carries its colour class tag, so two itemconfig calls reset them all
+        self.canvas.itemconfig("white_key", fill='white')
+        self.canvas.itemconfig("black_key", fill='black')
         self.result_label.config(text="")
 
     def semitone_to_note(self, semitone):
-        for note, val in NOTE_TO_SEMITONE.items():
-            if val == semitone and len(note) == 1:
-                return note
-        for note, val in NOTE_TO_SEMITONE.items():
-            if val == semitone:
-                return note
-        return "C"
+        return SEMITONE_TO_NOTE.get(semitone, "C")
 
     def _generate_sine_wave(self, frequency, duration=0.5, volume=0.3):
         """Generate a sine wave for audio synthesis."""
@@ -2743,22 +2763,20 @@ class EmbeddedMidiKeyboard:
         return 440.0 * (2.0 ** ((midi_note - 69) / 12.0))
 
     def _play_note(self, semitone, velocity=127):
-        note_num = 60 + semitone
-        
         # Send MIDI data only (clean approach like midiv3)
-        if getattr(self, 'midi_out', None):
+        note_on = self._midi_note_on
+        if note_on is not None:
             try:
-                self.midi_out.note_on(note_num, velocity)
+                note_on(60 + semitone, velocity)
             except Exception:
                 pass
 
     def _stop_note(self, semitone):
-        note_num = 60 + semitone
-        
         # Send MIDI stop only
-        if getattr(self, 'midi_out', None):
+        note_off = self._midi_note_off
+        if note_off is not None:
             try:
-                self.midi_out.note_off(note_num, 0)
+                note_off(60 + semitone, 0)
             except Exception:
                 pass
 
@@ -2831,11 +2849,8 @@ class EmbeddedMidiKeyboard:
                 for msg in self.midi_in:
                     try:
                         if msg.type in ('note_on', 'note_off'):
-                            pitch_class = msg.note % 12
-                            if msg.type == 'note_on' and getattr(msg, 'velocity', 0) > 0:
-                                self.parent.after(0, lambda pc=pitch_class: self.add_midi_note(pc))
-                            else:
-                                self.parent.after(0, lambda pc=pitch_class: self.remove_midi_note(pc))
+                            is_note_on = msg.type == 'note_on' and getattr(msg, 'velocity', 0) > 0
+                            self._midi_events.append((is_note_on, msg.note % 12))
                     except Exception as e:
                         print(f"MIDI message processing error: {e}")
                         continue
@@ -2843,6 +2858,28 @@ class EmbeddedMidiKeyboard:
                 print(f"MIDI loop error: {e}")
 
         threading.Thread(target=midi_loop, daemon=True).start()
+        if not self._midi_drain_running:
+            self._midi_drain_running = True
+            self._drain_midi()
+
+    def _drain_midi(self):
+        """Apply every MIDI note event queued by the listener thread, then poll again in 10 ms."""
+        try:
+            alive = self.parent.winfo_exists()
+        except tk.TclError:
+            alive = False
+        if not alive:
+            # Window closed: stop polling
+            self._midi_drain_running = False
+            return
+        events = self._midi_events
+        while events:
+            is_note_on, pitch_class = events.popleft()
+            if is_note_on:
+                self.add_midi_note(pitch_class)
+            else:
+                self.remove_midi_note(pitch_class)
+        self.parent.after(10, self._drain_midi)
 
     def add_midi_note(self, semitone):
         if semitone not in self.selected_notes:
@@ -2852,7 +2889,7 @@ class EmbeddedMidiKeyboard:
             note_name = self.semitone_to_note(semitone)
             self._set_key_color(note_name, True)
             self._play_note(semitone)
-            self.analyze_chord()
+            self._schedule_analysis()
 
     def remove_midi_note(self, semitone):
         if semitone in self.selected_notes:
@@ -2860,7 +2897,21 @@ class EmbeddedMidiKeyboard:
             note_name = self.semitone_to_note(semitone)
             self._set_key_color(note_name, False)
             self._stop_note(semitone)
+            self._schedule_analysis()
+
+    def _schedule_analysis(self):
+        """Run analyze_chord once shortly after a burst of note changes rather than per note."""
+        if self._analysis_pending:
+            return
+        self._analysis_pending = True
+        self.parent.after(30, self._flush_analysis)
+
+    def _flush_analysis(self):
+        self._analysis_pending = False
+        try:
             self.analyze_chord()
+        except Exception:
+            pass
 
     def analyze_chord(self):
         """Analyze selected notes using the main application's drive detection."""
@@ -2895,18 +2946,6 @@ class EmbeddedMidiKeyboard:
                             dim_chord_label = f"{dim_root}o7"
                             chord_str += f" [{dim_chord_label}]"
 
-                    # Handle enharmonic equivalents for certain roots
-                    root_name = chord_str.split(" ")[0]
-                    root_note = root_name.rstrip("#b")
-                    if root_note in NOTE_TO_SEMITONE:
-                        semitone = NOTE_TO_SEMITONE[root_note]
-                        if semitone in (8, 1, 3, 6, 10):  # G#, C#, D#, F#, A#
-                            enh = ENHARMONIC_EQUIVALENTS.get(semitone, root_note)
-                            if isinstance(enh, str) and '/' in enh:
-                                enh_roots = enh.split('/')
-                                if len(enh_roots) == 2 and root_note == enh_roots[0]:
-                                    chord_str += f" ({enh_roots[1]} root)"
-
                     lines.append(chord_str)
 
                 # Display detected drives/chords
@@ -2943,6 +2982,10 @@ class GridWindow(tk.Toplevel):
         'no5': "ⁿᵒ⁵",
         'noroot': "ⁿᵒ¹",  # optional alias for clarity
     }
+    # Longest keys first so a longer token is never shadowed by a shorter one
+    _SUPERSCRIPT_RE = re.compile('|'.join(map(re.escape, sorted(SUPERSCRIPT_MAP, key=len, reverse=True))))
+    # row-label image number -> PhotoImage of assets/images/<number>.png, shared by every grid window
+    _ROW_LABEL_PHOTOS: Dict[int, Any] = {}
 
     CELL_SIZE = 50
     PADDING = 40
@@ -2959,11 +3002,6 @@ class GridWindow(tk.Toplevel):
         "0-14": "#EEEEEE",     # Very light grey (not pure white)
     }
 
-    # For PDF (ReportLab) - System B: More subtle gradations
-    STRENGTH_COLORS_PDF = {
-        k: HexColor(v) for k, v in STRENGTH_COLORS_TK.items()
-    }
-
     def _dedupe_for_grid(self, raw_events: Dict[Tuple[int, int, str], Dict[str, Any]]) -> Dict[Tuple[int, int, str], Dict[str, Any]]:
         """Return events dict with immediate repeated patterns removed to match main display logic.
         Implements the same sliding-window dedupe algorithm used in MidiChordAnalyzer.display_results.
@@ -2973,6 +3011,14 @@ class GridWindow(tk.Toplevel):
             return dict(events_list)
 
         # Copy of the dedupe algorithm from display_results
+        # Build each event's order-free signature once and intern it to a small int so the
+        # pattern scan compares ints (via C-level list slices) instead of per comparison
+        sig_ids: Dict[Tuple, int] = {}
+        ids = [
+            sig_ids.setdefault((frozenset(data.get('chords', ())), frozenset(data.get('basses', ()))), len(sig_ids))
+            for _, data in events_list
+        ]
+
         filtered = []
         i = 0
         n = len(events_list)
@@ -2980,47 +3026,12 @@ class GridWindow(tk.Toplevel):
             max_pat = (n - i) // 2
             found_repeat = False
             for pat_len in range(1, max_pat + 1):
-                pat = [
-                    (tuple(sorted(events_list[i + j][1].get('chords', []))), tuple(sorted(events_list[i + j][1].get('basses', []))))
-                    for j in range(pat_len)
-                ]
-                repeat = True
-                for j in range(pat_len):
-                    if i + pat_len + j >= n:
-                        repeat = False
-                        break
-                    sig1 = (
-                        tuple(sorted(events_list[i + j][1].get('chords', []))),
-                        tuple(sorted(events_list[i + j][1].get('basses', [])))
-                    )
-                    sig2 = (
-                        tuple(sorted(events_list[i + pat_len + j][1].get('chords', []))),
-                        tuple(sorted(events_list[i + pat_len + j][1].get('basses', [])))
-                    )
-                    if sig1 != sig2:
-                        repeat = False
-                        break
-                if repeat:
+                pat = ids[i:i + pat_len]
+                if pat == ids[i + pat_len:i + 2 * pat_len]:
                     # keep the first occurrence, then skip any number of consecutive repeats
-                    jpos = i + pat_len
-                    while jpos + pat_len <= n:
-                        all_match = True
-                        for k in range(pat_len):
-                            sig_a = (
-                                tuple(sorted(events_list[i + k][1].get('chords', []))),
-                                tuple(sorted(events_list[i + k][1].get('basses', [])))
-                            )
-                            sig_b = (
-                                tuple(sorted(events_list[jpos + k][1].get('chords', []))),
-                                tuple(sorted(events_list[jpos + k][1].get('basses', [])))
-                            )
-                            if sig_a != sig_b:
-                                all_match = False
-                                break
-                        if all_match:
-                            jpos += pat_len
-                        else:
-                            break
+                    jpos = i + 2 * pat_len
+                    while jpos + pat_len <= n and ids[jpos:jpos + pat_len] == pat:
+                        jpos += pat_len
                     filtered.extend(events_list[i:i+pat_len])
                     i = jpos
                     found_repeat = True
@@ -3038,8 +3049,6 @@ class GridWindow(tk.Toplevel):
         self.main_app = main_app  # Store reference to main application
         
         # Configure white theme for GridWindow ttk widgets
-        import platform
-        from tkinter import ttk
         style = ttk.Style()
         style.configure("GridWindow.TFrame", background="white")
         
@@ -3053,6 +3062,19 @@ class GridWindow(tk.Toplevel):
         # Store references to custom parameters from parent
         self.custom_strength_map = getattr(parent, 'custom_strength_map', None)
         self.custom_rule_params = getattr(parent, 'custom_rule_params', None)
+
+        # Grid entropy scores depend only on the chord name, so each chord is scored once
+        self._entropy_analyzer = EntropyAnalyzer(
+            {},
+            base=2,
+            logger=lambda x: None,
+            strength_map=self.custom_strength_map,
+            rule_params=self.custom_rule_params
+        )
+        self._chord_scores: Dict[str, float] = {}
+        self._strength_categories: Dict[Tuple[str, Tuple[int, int, str]], str] = {}
+        self._chords_by_root: Dict[Tuple[int, int, str], Dict[Optional[str], str]] = {}  # see get_chords_by_root
+        self._entropies: Optional[Dict[Tuple[int, int, str], float]] = None  # filled by compute_entropies
         
         # Apply same filtering as main window (respect include_non_drive_events)
         raw_events = {k: v for k, v in events.items()} if events else {}
@@ -3082,7 +3104,7 @@ class GridWindow(tk.Toplevel):
             controls_frame,
             text="Show Resolution Patterns",
             variable=self.show_resolutions_var,
-            command=self.redraw,
+            command=lambda: self._request_redraw(self.redraw_resolutions),
         ).pack(side="left", padx=5)
 
         self.color_pdf_var = tk.BooleanVar(value=True)
@@ -3090,7 +3112,7 @@ class GridWindow(tk.Toplevel):
             controls_frame,
             text="Color-code Chords",
             variable=self.color_pdf_var,
-            command=self.redraw
+            command=lambda: self._request_redraw(self.recolor_chords)
         ).pack(side="left", padx=5)
 
         self.show_entropy_var = tk.BooleanVar(value=False)
@@ -3098,7 +3120,7 @@ class GridWindow(tk.Toplevel):
             controls_frame,
             text="Show Entropy",
             variable=self.show_entropy_var,
-            command=self.redraw_entropy
+            command=lambda: self._request_redraw(self.redraw_entropy)
         ).pack(side="left", padx=5)
         
         ttk.Button(
@@ -3108,8 +3130,6 @@ class GridWindow(tk.Toplevel):
         ).pack(side="left", padx=5)
 
         # Center the whole frame
-        controls_frame.update_idletasks()
-        frame_width = controls_frame.winfo_width()
         controls_frame.pack_configure(anchor="center")
 
         # --- Canvas container below controls ---
@@ -3140,11 +3160,13 @@ class GridWindow(tk.Toplevel):
         self.canvas.bind("<Motion>", self.on_mouse_move)
         self.canvas.bind("<Leave>", lambda e: self.tooltip.place_forget())
 
+        self._pending_redraws = []  # redraw steps queued for the next idle by _request_redraw
         self.chord_positions = []
+        self._chord_pos_by_cell = {}  # (col, row) -> (index in chord_positions, x, y, chord), for hover hit-tests
+        self.chord_shapes = []  # (canvas item, strength colour) of each chord shape, for recolor_chords
         self.draw_grid()
 
-        # Set scroll region after drawing
-        self.canvas.update_idletasks()
+        # Set scroll region after drawing (bbox is computed from the items, no layout pass needed)
         self.canvas.config(scrollregion=self.canvas.bbox("all"))
         # Populate frozen left column with enharmonic alternatives and labels
         enh_map = {
@@ -3161,27 +3183,26 @@ class GridWindow(tk.Toplevel):
             image_number = len(self.root_list) - row
             
             try:
-                # Load the corresponding numbered image (use os.path.join for cross-platform paths)
-                image_path = resource_path(os.path.join("assets", "images", f"{image_number}.png"))
-                img = Image.open(image_path)
-                photo = ImageTk.PhotoImage(img)
+                # Load the corresponding numbered image (use os.path.join for cross-platform paths);
+                # decoded once and reused by every later grid window
+                photo = self._ROW_LABEL_PHOTOS.get(image_number)
+                if photo is None:
+                    image_path = resource_path(os.path.join("assets", "images", f"{image_number}.png"))
+                    photo = ImageTk.PhotoImage(Image.open(image_path))
+                    # The cache also keeps the reference that prevents garbage collection
+                    self._ROW_LABEL_PHOTOS[image_number] = photo
                 
                 # Create image on canvas, centered in the left column
                 x_center = left_col_width // 2
                 self.left_canvas.create_image(x_center, y, image=photo, anchor='center')
                 
-                # Keep a reference to prevent garbage collection
-                if not hasattr(self, '_label_images'):
-                    self._label_images = []
-                self._label_images.append(photo)
-                
             except Exception as e:
                 # Fallback to text if image loading fails
                 print(f"[WARNING] Failed to load image {image_number}.png: {e}")
 
                 try:
                     # Simple fallback text
-                    fallback_text = root.replace('b', '♭').replace('#', '♯')
+                    fallback_text = beautify_chord(root)
                     self.left_canvas.create_text(left_col_width - 8, y, text=fallback_text, anchor='e', font=("Segoe UI", 12), fill="black")
                 except Exception as ex:
                     print(f"[ERROR] Failed to create fallback label for root {root}: {ex}")
@@ -3197,7 +3218,6 @@ class GridWindow(tk.Toplevel):
     # Inside GridWindow
 
     def show_entropy_info_window(self, entropy_text):
-        import platform
         info_win = tk.Toplevel(self)
         info_win.title("Entropy Review")
         info_win.configure(bg="white")
@@ -3254,7 +3274,6 @@ class GridWindow(tk.Toplevel):
         y = (info_win.winfo_screenheight() - window_height) // 2
         info_win.geometry(f"{window_width}x{window_height}+{x}+{y}")
         def save_entropy_info():
-            from tkinter import filedialog
             path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text files", "*.txt")], title="Save Entropy Info")
             if path:
                 with open(path, "w", encoding="utf-8") as f:
@@ -3268,6 +3287,16 @@ class GridWindow(tk.Toplevel):
         save_btn.pack(pady=(0,10))
 
 
+    def compute_entropies(self) -> Dict[Tuple[int, int, str], float]:
+        """
+        Entropy of every grid event, computed on first use and shared by the
+        on-screen entropy trace and the PDF export (the window's events never change).
+        """
+        entropies = self._entropies
+        if entropies is None:
+            entropies = self._entropies = {ek: self.compute_entropy(ek) for ek in self.sorted_events}
+        return entropies
+
     def compute_entropy(self, event_key: Tuple[int, int, str]) -> float:
         """
         Compute weighted chord strength entropy for a given event.
@@ -3279,21 +3308,19 @@ class GridWindow(tk.Toplevel):
         if not chords:
             return 0.0
 
-        analyzer = EntropyAnalyzer(
-            {event_key: payload}, 
-            base=2, 
-            logger=lambda x: None,
-            strength_map=self.custom_strength_map,
-            rule_params=self.custom_rule_params
-        )    
+        analyzer = self._entropy_analyzer
+        chord_scores = self._chord_scores
         scores = []
         for chord in chords:
-            score = analyzer._compute_score(chord)
-            if isinstance(score, tuple):
-                for x in score:
-                    if isinstance(x, (int, float)):
-                        score = x
-                        break
+            score = chord_scores.get(chord)
+            if score is None:
+                score = analyzer._compute_score(chord, with_messages=False)
+                if isinstance(score, tuple):
+                    for x in score:
+                        if isinstance(x, (int, float)):
+                            score = x
+                            break
+                chord_scores[chord] = score
             scores.append(score)
         H = analyzer._weighted_entropy(scores, base=2)
         return H
@@ -3318,9 +3345,10 @@ class GridWindow(tk.Toplevel):
         DOT_RADIUS = 3
         buffer = 10            # extra space so dots aren’t clipped
 
-        # If entropy display is turned off, clear any stored points and remove drawing
+        # If entropy display is turned off, clear the tooltip points and hide the drawing
+        # (kept on the canvas so turning it back on does not rebuild it)
         if not self.show_entropy_var.get():
-            self.canvas.delete("entropy_graph")
+            self.canvas.itemconfigure("entropy_graph", state="hidden")
             self.entropy_points = []
             # Restore previous geometry
             try:
@@ -3330,8 +3358,11 @@ class GridWindow(tk.Toplevel):
                 pass
             return
 
-        # Remove any previous entropy graph
-        self.canvas.delete("entropy_graph")
+        # The graph is built on first display only; later toggles just show the hidden items again
+        if self.canvas.find_withtag("entropy_graph"):
+            self.canvas.itemconfigure("entropy_graph", state="normal")
+            self.entropy_points = self._entropy_trace_points
+            return
 
         # Calculate axis positions
         axis_x = self.PADDING - 14  # a little to the left of the grid
@@ -3340,12 +3371,12 @@ class GridWindow(tk.Toplevel):
         y_top = y_base - 4 * ENTROPY_SCALE
 
         # Calculate entropy points (store H so tooltips can show values)
-        points = []
-        for idx, event_key in enumerate(self.sorted_events):
-            H = self.compute_entropy(event_key)
-            x = self.PADDING + idx * self.CELL_SIZE + self.CELL_SIZE // 2
-            y = y_base - H * ENTROPY_SCALE
-            points.append((x, y, H))
+        entropies = self.compute_entropies()
+        x0 = self.PADDING + self.CELL_SIZE // 2
+        points = [
+            (x0 + idx * self.CELL_SIZE, y_base - H * ENTROPY_SCALE, H)
+            for idx, H in enumerate(entropies[event_key] for event_key in self.sorted_events)
+        ]
 
         # Draw Y-axis
         self.canvas.create_line(axis_x, y_base, axis_x, y_top, fill="black", width=2, tags="entropy_graph")
@@ -3368,11 +3399,12 @@ class GridWindow(tk.Toplevel):
             self.canvas.create_line(axis_x - 5, y, axis_x + 5, y, fill="black", tags="entropy_graph")
             self.canvas.create_text(axis_x - 10, y, text=f"{H_val}", anchor="e", font=("Segoe UI", 9), tags="entropy_graph")
 
-        # --- Draw connecting lines for entropy points ---
-        for i in range(len(points) - 1):
-            x1, y1, _ = points[i]
-            x2, y2, _ = points[i + 1]
-            self.canvas.create_line(x1, y1, x2, y2, fill="red", width=2, tags="entropy_graph")
+        # --- Draw connecting lines for entropy points (one polyline item) ---
+        if len(points) > 1:
+            self.canvas.create_line(
+                *[c for x, y, _ in points for c in (x, y)],
+                fill="red", width=2, tags="entropy_graph"
+            )
 
         # --- Draw dots ---
         for x, y, _ in points:
@@ -3382,16 +3414,25 @@ class GridWindow(tk.Toplevel):
             )
 
         # Store points with entropy values for the tooltip handler
-        self.entropy_points = points
+        self.entropy_points = self._entropy_trace_points = points
 
         # --- Update scroll region ---
         scroll_width = self.PADDING + len(self.sorted_events) * self.CELL_SIZE
         self.canvas.config(scrollregion=(0, 0, scroll_width, canvas_height))
 
 
+    # chord name -> classify_chord_type result, shared by every grid window
+    _CHORD_TYPES: Dict[str, str] = {}
+
     def classify_chord_type(self, chord):
         """Classify chord type for shape determination (kept for triangle/circle shapes)."""
-        chord = chord.replace("♭", "b").replace("♯", "#")
+        chord_type = self._CHORD_TYPES.get(chord)
+        if chord_type is None:
+            chord_type = self._CHORD_TYPES[chord] = self._classify_chord_type(chord)
+        return chord_type
+
+    def _classify_chord_type(self, chord):
+        chord = chord.translate(_ASCII_ACCIDENTALS_TRANS)
         if "no" in chord.lower():
             return "no"
 
@@ -3420,17 +3461,18 @@ class GridWindow(tk.Toplevel):
 
     def get_chord_strength_category(self, chord, event_key):
         """Calculate chord strength percentage and return color category."""
+        # Events and scoring parameters are fixed for the window, so each cell is computed once
+        category = self._strength_categories.get((chord, event_key))
+        if category is None:
+            category = self._strength_categories[(chord, event_key)] = self._chord_strength_category(chord, event_key)
+        return category
+
+    def _chord_strength_category(self, chord, event_key):
         # Get the event data
         event_data = self.events.get(event_key, {})
         
         # Calculate chord strength using entropy analyzer
-        analyzer = EntropyAnalyzer(
-            {event_key: event_data}, 
-            base=2, 
-            logger=lambda x: None,
-            strength_map=self.custom_strength_map,
-            rule_params=self.custom_rule_params
-        )
+        analyzer = self._entropy_analyzer
         
         # Get all chord strengths for this event to calculate probabilities
         chords = event_data.get("chords", [])
@@ -3442,7 +3484,7 @@ class GridWindow(tk.Toplevel):
         # Calculate scores for all chords in this event
         chord_scores = []
         for c in chords:
-            score, _ = analyzer._compute_score(c, basses, event_data)
+            score, _ = analyzer._compute_score(c, basses, event_data, with_messages=False)
             chord_scores.append((c, score))
         
         # Find the score for our specific chord
@@ -3491,10 +3533,11 @@ class GridWindow(tk.Toplevel):
         from reportlab.pdfgen import canvas as pdf_canvas
 
         import os, math
-        # Always use the bundled DejaVuSans.ttf from assets/fonts
+        # Always use the bundled DejaVuSans.ttf from assets/fonts; parse and
+        # register it only on the first export, reportlab keeps it afterwards
         font_path = resource_path(os.path.join('assets', 'fonts', 'DejaVuSans.ttf'))
         try:
-            if os.path.exists(font_path):
+            if 'DejaVuSans' not in pdfmetrics.getRegisteredFontNames() and os.path.exists(font_path):
                 pdfmetrics.registerFont(TTFont('DejaVuSans', font_path))
         except Exception as e:
             print(f"Warning: Could not register DejaVuSans font: {e}")
@@ -3509,6 +3552,9 @@ class GridWindow(tk.Toplevel):
         if not pdf_path:
             return
 
+        # For PDF (ReportLab) - built here so reportlab is only imported on export
+        strength_colors_pdf = {k: HexColor(v) for k, v in self.STRENGTH_COLORS_TK.items()}
+
         try:
             c = pdf_canvas.Canvas(pdf_path, pagesize=landscape(A4))
             width, height = landscape(A4)
@@ -3561,7 +3607,11 @@ class GridWindow(tk.Toplevel):
             radius = int(cell_size * 0.65 / 2)  # Reduced from 0.85 to make triangles smaller
             circle_radius = int(cell_size * 0.80 / 2)  # Larger radius for circles only in PDF
 
-            entropies_all = {ek: self.compute_entropy(event_key=ek) for ek in self.sorted_events}
+            entropies_all = self.compute_entropies()
+
+            # Row labels are the same on every page
+            enh_map = {'F#': 'F#/Gb', 'Db': 'Db/C#', 'Ab': 'Ab/G#', 'Eb': 'Eb/D#'}
+            row_labels = [(row, beautify_chord(enh_map.get(root, root))) for root, row in self.root_to_row.items()]
 
             for page in range(num_pages):
                 start_col = page * page_grid_cols
@@ -3569,154 +3619,169 @@ class GridWindow(tk.Toplevel):
                 visible_events = self.sorted_events[start_col:end_col]
                 visible_cols = len(visible_events)
 
-                # Row labels + horizontal grid lines
-                for root, row in self.root_to_row.items():
-                    y_center = height - (margin_y + row * cell_size + cell_size / 2)
-                    c.setFont("DejaVuSans", 12)
-                    enh_map = {'F#': 'F#/Gb', 'Db': 'Db/C#', 'Ab': 'Ab/G#', 'Eb': 'Eb/D#'}
-                    label_raw = enh_map.get(root, root)
-                    note_label = label_raw.replace('b', '♭').replace('#', '♯')
-                    c.drawRightString(margin_left - 8, y_center - 4, note_label)
+                # Cell-centre coordinates for this page, shared by every drawing pass below
+                col_x = [margin_left + col_idx * cell_size + cell_size / 2 for col_idx in range(visible_cols)]
+                row_y = [height - (margin_y + row * cell_size + cell_size / 2) for row in range(grid_rows)]
+
+                # Row labels + horizontal grid lines (lines collected and stroked in one call)
+                grid_lines = []
+                c.setFont("DejaVuSans", 12)
+                for row, note_label in row_labels:
+                    c.drawRightString(margin_left - 8, row_y[row] - 4, note_label)
 
                     y_line = height - (margin_y + row * cell_size)
-                    c.setStrokeColor(HexColor("#dddddd"))
-                    c.line(margin_left, y_line, margin_left + visible_cols * cell_size, y_line)
+                    grid_lines.append((margin_left, y_line, margin_left + visible_cols * cell_size, y_line))
 
                 # Column labels + vertical lines
+                c.setFont("Helvetica", 10)
+                label_y = height - (margin_y - 18)
+                line_top = height - margin_y
+                line_bottom = height - (margin_y + grid_rows * cell_size)
                 for col_idx, (bar, beat, ts) in enumerate(visible_events):
-                    x = margin_left + col_idx * cell_size + cell_size / 2
-                    label = f"{bar}.{beat}"
-                    c.setFont("Helvetica", 10)
-                    c.drawCentredString(x, height - (margin_y - 18), label)
+                    c.drawCentredString(col_x[col_idx], label_y, f"{bar}.{beat}")
 
                     x_line = margin_left + col_idx * cell_size
-                    c.setStrokeColor(HexColor("#dddddd"))
-                    c.line(x_line, height - margin_y, x_line, height - (margin_y + grid_rows * cell_size))
-
-                # Optional resolution arrows (drawn after grid lines but before chord shapes)
-                if self.show_resolutions_var.get():
-                    pos_dict = {}
-                    for col_idx, event_key in enumerate(visible_events):
-                        event_data = self.events[event_key]
-                        chords_by_root = {}
-                        for chord in event_data.get("chords", []):
-                            root = self.get_root(chord)
-                            chords_by_root[root] = chord
-                        for root, chord in chords_by_root.items():
-                            if root not in self.root_to_row:
-                                continue
-                            row = self.root_to_row[root]
-                            x = margin_left + col_idx * cell_size + cell_size / 2
-                            y = height - (margin_y + row * cell_size + cell_size / 2)
-                            pos_dict[(col_idx, row)] = (x, y, chord)
-
-                    # Arrows start from grid center and appear behind chord shapes
-                    end_offset = cell_size * 0.55  # Reduced from 0.75 to make arrows longer
-                    for (col, row), (x1, y1, chord1) in pos_dict.items():
-                        diag_pos = (col + 1, row + 1)
-                        if diag_pos in pos_dict:
-                            x2, y2, chord2 = pos_dict[diag_pos]
-                            dx = x2 - x1
-                            dy = y2 - y1
-                            dist = (dx**2 + dy**2) ** 0.5
-                            if dist == 0:
-                                continue
-                            dx_norm = dx / dist
-                            dy_norm = dy / dist
-                            # Start from grid center (not circle edge)
-                            start_x = x1
-                            start_y = y1
-                            end_x = x2 - dx_norm * end_offset
-                            end_y = y2 - dy_norm * end_offset
-                            
-                            # Draw arrow line
-                            c.setStrokeColor(black)
-                            c.setLineWidth(1.5)
-                            c.setLineCap(1)
-                            c.line(start_x, start_y, end_x, end_y)
-                            
-                            # Draw arrowhead
-                            arrow_size = 6  # Increased to make PDF arrowheads more prominent
-                            angle = math.atan2(dy_norm, dx_norm)
-                            left_angle = angle + math.pi / 6
-                            right_angle = angle - math.pi / 6
-                            
-                            tip_x = end_x
-                            tip_y = end_y
-                            left_x = tip_x - arrow_size * math.cos(left_angle)
-                            left_y = tip_y - arrow_size * math.sin(left_angle)
-                            right_x = tip_x - arrow_size * math.cos(right_angle)
-                            right_y = tip_y - arrow_size * math.sin(right_angle)
-                            
-                            c.setFillColor(black)
-                            c.setStrokeColor(black)
-                            c.setLineWidth(0.5)
-                            path = c.beginPath()
-                            path.moveTo(tip_x, tip_y)
-                            path.lineTo(left_x, left_y)
-                            path.lineTo(right_x, right_y)
-                            path.close()
-                            c.drawPath(path, stroke=1, fill=1)
+                    grid_lines.append((x_line, line_top, x_line, line_bottom))
 
-                # Chords
+                c.setStrokeColor(HexColor("#dddddd"))
+                c.lines(grid_lines)
+
+                # One walk over the page's columns collects everything drawn per chord and bass:
+                # arrow endpoints, chord shapes (one path per fill colour), function labels and
+                # bass dots (one path). They are emitted afterwards in layer order: arrows,
+                # shapes, labels, border, dots.
+                show_resolutions = self.show_resolutions_var.get()
+                pos_dict = {}  # (col, row) -> (x, y), for the resolution arrows
+                shape_paths = {}  # strength category (None when not colour-coding) -> path
+                labels = []  # (x, y, label, text colour)
+                dots_path = c.beginPath()
+                dot_radius = 2.5
                 for col_idx, event_key in enumerate(visible_events):
-                    event_data = self.events[event_key]
-                    chords_by_root = {}
-                    for chord in event_data.get("chords", []):
-                        root = self.get_root(chord)
-                        chords_by_root[root] = chord
+                    x = col_x[col_idx]
+                    chords_by_root = self.get_chords_by_root(event_key)
 
                     for root, chord in chords_by_root.items():
                         if root not in self.root_to_row:
                             continue
                         row = self.root_to_row[root]
-                        x = margin_left + col_idx * cell_size + cell_size / 2
-                        y = height - (margin_y + row * cell_size + cell_size / 2)
+                        y = row_y[row]
+                        if show_resolutions:
+                            pos_dict[(col_idx, row)] = (x, y)
 
                         chord_type = self.classify_chord_type(chord)
                         strength_category = self.get_chord_strength_category(chord, event_key)
-                        fill_color = self.STRENGTH_COLORS_PDF.get(strength_category, HexColor("#CCCCCC")) if use_color else HexColor("#FFFFFF")
-                        c.setFillColor(fill_color)
-                        c.setStrokeColor(black)
+                        fill_key = strength_category if use_color else None
+                        path = shape_paths.get(fill_key)
+                        if path is None:
+                            path = shape_paths[fill_key] = c.beginPath()
 
                         if chord_type == "maj":
-                            path = c.beginPath()
                             path.moveTo(x, y + radius)
                             path.lineTo(x - radius, y - radius)
                             path.lineTo(x + radius, y - radius)
                             path.close()
-                            c.drawPath(path, stroke=1, fill=1 if use_color else 0)
                         elif chord_type == "min":
-                            path = c.beginPath()
                             path.moveTo(x, y - radius)
                             path.lineTo(x - radius, y + radius)
                             path.lineTo(x + radius, y + radius)
                             path.close()
-                            c.drawPath(path, stroke=1, fill=1 if use_color else 0)
                         else:
-                            c.circle(x, y, circle_radius, stroke=1, fill=1 if use_color else 0)
+                            path.circle(x, y, circle_radius)
 
                         if chord_type not in ("maj", "min"):
                             function_label = chord[len(root):] or "–"
                             function_label_lower = function_label.lower()
-                            replaced = False
-                            for key, superscript in self.SUPERSCRIPT_MAP.items():
-                                if key in function_label_lower:
-                                    function_label = function_label_lower.replace(key, superscript)
-                                    replaced = True
-                                    break
-                            if not replaced:
+                            new_label = self._SUPERSCRIPT_RE.sub(
+                                lambda m: self.SUPERSCRIPT_MAP[m.group(0)], function_label_lower
+                            )
+                            if new_label != function_label_lower:
+                                function_label = new_label
+                            else:
                                 function_label = beautify_chord(function_label)
                             # Use white text on dark backgrounds, black text on light backgrounds
                             # For System B: white text on the darkest 4 categories, black text on the lighter 4
-                            text_color = HexColor("#FFFFFF") if strength_category in ["60+", "50-59", "40-49", "30-39"] else HexColor("#000000")
-                            c.setFillColor(text_color)
-                            c.setFont("DejaVuSans", 8)
-                            c.drawCentredString(x, y - 4, function_label)
+                            text_color = "#FFFFFF" if strength_category in ["60+", "50-59", "40-49", "30-39"] else "#000000"
+                            labels.append((x, y, function_label, text_color))
 
+                    event_data = self.events[event_key]
+                    for bass in event_data.get("basses", []):
+                        bass_root = self.get_root(bass)
+                        if bass_root not in self.root_to_row:
+                            continue
+                        by = row_y[self.root_to_row[bass_root]]
+
+                        # Size the offset by the shape of the first chord on the bass's root
+                        # (triangle radius when there is no chord there)
+                        chord_at_position = next(
+                            (chord for chord in event_data.get("chords", []) if self.get_root(chord) == bass_root),
+                            None,
+                        )
+                        if chord_at_position is not None and self.classify_chord_type(chord_at_position) not in ("maj", "min"):
+                            shape_radius = circle_radius
+                        else:
+                            shape_radius = radius
 
+                        # Position dot at bottom edge of shape, matching tkinter positioning
+                        # PDF coordinates: Y increases upward, tkinter increases downward
+                        # In tkinter: by + radius places dot at bottom of shape
+                        # In PDF: by - radius places dot at bottom of shape
+                        dots_path.circle(x, by - shape_radius, dot_radius)
 
+                # Optional resolution arrows (drawn after grid lines but before chord shapes)
+                if show_resolutions:
+                    # Arrows start from grid center and appear behind chord shapes.
+                    # Every arrow joins a cell to its lower-right neighbour, so the
+                    # direction and arrowhead offsets are the same for all of them.
+                    end_offset = cell_size * 0.55  # Reduced from 0.75 to make arrows longer
+                    arrow_size = 6  # Increased to make PDF arrowheads more prominent
+                    dist = math.hypot(cell_size, cell_size)
+                    dx_norm = cell_size / dist
+                    dy_norm = -cell_size / dist
+                    end_dx = dx_norm * end_offset
+                    end_dy = dy_norm * end_offset
+                    angle = math.atan2(dy_norm, dx_norm)
+                    left_dx = arrow_size * math.cos(angle + math.pi / 6)
+                    left_dy = arrow_size * math.sin(angle + math.pi / 6)
+                    right_dx = arrow_size * math.cos(angle - math.pi / 6)
+                    right_dy = arrow_size * math.sin(angle - math.pi / 6)
+
+                    arrow_lines = []
+                    heads_path = c.beginPath()
+                    for (col, row), (x1, y1) in pos_dict.items():
+                        diag_pos = (col + 1, row + 1)
+                        if diag_pos in pos_dict:
+                            x2, y2 = pos_dict[diag_pos]
+                            tip_x = x2 - end_dx
+                            tip_y = y2 - end_dy
+                            arrow_lines.append((x1, y1, tip_x, tip_y))
+                            heads_path.moveTo(tip_x, tip_y)
+                            heads_path.lineTo(tip_x - left_dx, tip_y - left_dy)
+                            heads_path.lineTo(tip_x - right_dx, tip_y - right_dy)
+                            heads_path.close()
+
+                    if arrow_lines:
+                        c.setStrokeColor(black)
+                        c.setLineWidth(1.5)
+                        c.setLineCap(1)
+                        c.lines(arrow_lines)
 
+                        c.setFillColor(black)
+                        c.setLineWidth(0.5)
+                        c.drawPath(heads_path, stroke=1, fill=1)
+
+                c.setStrokeColor(black)
+                for fill_key, path in shape_paths.items():
+                    fill_color = strength_colors_pdf.get(fill_key, HexColor("#CCCCCC")) if use_color else HexColor("#FFFFFF")
+                    c.setFillColor(fill_color)
+                    c.drawPath(path, stroke=1, fill=1 if use_color else 0)
+
+                c.setFont("DejaVuSans", 8)
+                current_text_color = None
+                for x, y, function_label, text_color in labels:
+                    if text_color != current_text_color:
+                        c.setFillColor(HexColor(text_color))
+                        current_text_color = text_color
+                    c.drawCentredString(x, y - 4, function_label)
 
                 c.setStrokeColor(HexColor("#dddddd"))
                 c.setLineWidth(1)
@@ -3729,36 +3794,9 @@ class GridWindow(tk.Toplevel):
                     fill=0
                 )
 
-                # Draw bass dots AFTER grid lines to ensure they appear on top
-                for col_idx, event_key in enumerate(visible_events):
-                    event_data = self.events[event_key]
-                    for bass in event_data.get("basses", []):
-                        bass_root = self.get_root(bass)
-                        if bass_root not in self.root_to_row:
-                            continue
-                        brow = self.root_to_row[bass_root]
-                        bx = margin_left + col_idx * cell_size + cell_size / 2
-                        by = height - (margin_y + brow * cell_size + cell_size / 2)
-                        dot_radius = 2.5
-                        
-                        # Determine which radius to use based on chord type at this position
-                        # Check if there's a chord at this position to determine shape size
-                        chords_at_position = [chord for chord in event_data.get("chords", []) 
-                                            if self.get_root(chord) == bass_root]
-                        if chords_at_position:
-                            chord = chords_at_position[0]
-                            chord_type = self.classify_chord_type(chord)
-                            shape_radius = circle_radius if chord_type not in ("maj", "min") else radius
-                        else:
-                            shape_radius = radius  # Default to triangle radius if no chord
-                        
-                        # Position dot at bottom edge of shape, matching tkinter positioning
-                        # PDF coordinates: Y increases upward, tkinter increases downward
-                        # In tkinter: by + radius places dot at bottom of shape
-                        # In PDF: by - radius places dot at bottom of shape
-                        dot_y_position = by - shape_radius
-                        c.setFillColor(black)
-                        c.circle(bx, dot_y_position, dot_radius, fill=1, stroke=0)
+                # Bass dots go on top of the shapes and the grid border
+                c.setFillColor(black)
+                c.drawPath(dots_path, fill=1, stroke=0)
 
                 # PDF entropy band
                 if show_entropy_pdf:
@@ -3782,21 +3820,18 @@ class GridWindow(tk.Toplevel):
                     pts = []
                     for col_idx, ek in enumerate(visible_events):
                         H = float(entropies_all.get(ek, 0.0))
-                        x = margin_left + col_idx * cell_size + cell_size / 2
-                        y = y_base + H * ENTROPY_SCALE_PDF
-                        pts.append((x, y))
+                        pts.append((col_x[col_idx], y_base + H * ENTROPY_SCALE_PDF))
 
                     c.setStrokeColor(HexColor("#cc0000"))
                     c.setLineWidth(1.5)
-                    for i in range(len(pts) - 1):
-                        x1, y1 = pts[i]
-                        x2, y2 = pts[i + 1]
-                        c.line(x1, y1, x2, y2)
+                    c.lines([(x1, y1, x2, y2) for (x1, y1), (x2, y2) in zip(pts, pts[1:])])
 
-                    c.setFillColor(HexColor("#cc0000"))
                     dot_r = 1.8
+                    entropy_dots = c.beginPath()
                     for x, y in pts:
-                        c.circle(x, y, dot_r, fill=1, stroke=0)
+                        entropy_dots.circle(x, y, dot_r)
+                    c.setFillColor(HexColor("#cc0000"))
+                    c.drawPath(entropy_dots, fill=1, stroke=0)
 
                 c.setFont("Helvetica", 9)
                 c.setFillColor(black)
@@ -3806,7 +3841,6 @@ class GridWindow(tk.Toplevel):
                 
                 # Draw filename on the left (if available)
                 if self.main_app and hasattr(self.main_app, 'loaded_file_path') and self.main_app.loaded_file_path:
-                    import os
                     filename = os.path.basename(self.main_app.loaded_file_path)
                     c.drawString(30, 20, filename)
 
@@ -3817,11 +3851,32 @@ class GridWindow(tk.Toplevel):
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export PDF:\n{e}")
             
-    def redraw(self):
-        self.canvas.delete("all")
-        self.draw_grid()
-        self.canvas.update_idletasks()
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+    def _request_redraw(self, step):
+        """Run a redraw step once on the next idle, however often it is requested before then."""
+        if not self._pending_redraws:
+            self.after_idle(self._run_pending_redraws)
+        if step not in self._pending_redraws:
+            self._pending_redraws.append(step)
+
+    def _run_pending_redraws(self):
+        steps, self._pending_redraws = self._pending_redraws, []
+        for step in steps:
+            step()
+
+    # The option toggles below only touch their own tagged items; the grid, labels,
+    # bass dots and entropy trace stay on the canvas
+    def redraw_resolutions(self):
+        self.canvas.delete("resolution_arrow")
+        if self.show_resolutions_var.get():
+            self.draw_resolution_arrows()
+            # Arrows sit behind the chord shapes but above the grid lines
+            if self.chord_shapes:
+                self.canvas.tag_lower("resolution_arrow", "chord_shape")
+
+    def recolor_chords(self):
+        use_color = self.color_pdf_var.get()
+        for item, strength_color in self.chord_shapes:
+            self.canvas.itemconfigure(item, fill=strength_color if use_color else "white")
 
     def draw_grid(self):
         radius = int(self.CELL_SIZE * 0.65 / 2)  # Reduced from 0.85 to make triangles smaller
@@ -3845,57 +3900,15 @@ class GridWindow(tk.Toplevel):
 
         # Draw resolution arrows AFTER grid lines but BEFORE chord shapes (so arrows appear behind shapes)
         if self.show_resolutions_var.get():
-            # First, collect all chord positions
-            chord_positions = []
-            for col, event_key in enumerate(self.sorted_events):
-                event_data = self.events[event_key]
-                chords = event_data.get("chords", set())
-                chords_by_root = {}
-                for chord in chords:
-                    root = self.get_root(chord)
-                    chords_by_root[root] = chord
-                
-                for root, chord in chords_by_root.items():
-                    if root not in self.root_to_row:
-                        continue
-                    row = self.root_to_row[root]
-                    x = self.PADDING + col * self.CELL_SIZE + self.CELL_SIZE // 2
-                    y = self.PADDING + row * self.CELL_SIZE + self.CELL_SIZE // 2
-                    chord_positions.append((col, row, x, y, chord))
-            
-            # Draw arrows from grid centers (will be hidden behind chord shapes)
-            pos_dict = {(col, row): (x, y, chord) for col, row, x, y, chord in chord_positions}
-            end_offset = self.CELL_SIZE * 0.55  # Reduced from 0.75 to make arrows longer
-            for (col, row), (x1, y1, chord1) in pos_dict.items():
-                diag_pos = (col + 1, row + 1)
-                if diag_pos in pos_dict:
-                    x2, y2, chord2 = pos_dict[diag_pos]
-                    dx = x2 - x1
-                    dy = y2 - y1
-                    dist = (dx**2 + dy**2) ** 0.5
-                    if dist == 0:
-                        continue
-                    dx_norm = dx / dist
-                    dy_norm = dy / dist
-                    # Start from grid center (not circle edge)
-                    start_x = x1
-                    start_y = y1
-                    end_x = x2 - dx_norm * end_offset
-                    end_y = y2 - dy_norm * end_offset
-                    self.canvas.create_line(start_x, start_y, end_x, end_y, arrow=tk.LAST, fill="black", width=3)
+            self.draw_resolution_arrows()
 
         self.chord_positions.clear()
+        self._chord_pos_by_cell.clear()
+        self.chord_shapes.clear()
 
         # Draw chords as circles/triangles
         for col, event_key in enumerate(self.sorted_events):
-            event_data = self.events[event_key]
-            chords = event_data.get("chords", set())
-            bass_notes = event_data.get("basses", [])
-
-            chords_by_root = {}
-            for chord in chords:
-                root = self.get_root(chord)
-                chords_by_root[root] = chord
+            chords_by_root = self.get_chords_by_root(event_key)
 
             # Draw chord shapes (if any chords)
             if chords_by_root:
@@ -3910,7 +3923,8 @@ class GridWindow(tk.Toplevel):
                     chord_type = self.classify_chord_type(chord)
                     # Get strength category for color determination  
                     strength_category = self.get_chord_strength_category(chord, event_key)
-                    fill_color = self.STRENGTH_COLORS_TK.get(strength_category, "#CCCCCC") if self.color_pdf_var.get() else "white"
+                    strength_color = self.STRENGTH_COLORS_TK.get(strength_category, "#CCCCCC")
+                    fill_color = strength_color if self.color_pdf_var.get() else "white"
 
                     if chord_type == "maj":
                         # Upward pointing triangle
@@ -3919,7 +3933,7 @@ class GridWindow(tk.Toplevel):
                             x - radius, y + radius,  # bottom-left vertex
                             x + radius, y + radius,  # bottom-right vertex
                         ]
-                        self.canvas.create_polygon(points, fill=fill_color, outline="black")
+                        item = self.canvas.create_polygon(points, fill=fill_color, outline="black", tags="chord_shape")
                     elif chord_type == "min":
                         # Downward pointing triangle
                         points = [
@@ -3927,11 +3941,13 @@ class GridWindow(tk.Toplevel):
                             x - radius, y - radius,  # top-left vertex
                             x + radius, y - radius,  # top-right vertex
                         ]
-                        self.canvas.create_polygon(points, fill=fill_color, outline="black")
+                        item = self.canvas.create_polygon(points, fill=fill_color, outline="black", tags="chord_shape")
                     else:
-                        self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius, fill=fill_color, outline="black")
+                        item = self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius, fill=fill_color, outline="black", tags="chord_shape")
 
+                    self._chord_pos_by_cell[(col, row)] = (len(self.chord_positions), x, y, chord)
                     self.chord_positions.append((col, row, x, y, chord))
+                    self.chord_shapes.append((item, strength_color))
             # If no chords, leave column blank but show bass dots below
 
         # ALWAYS draw bass dots for each column based on event_data["basses"]
@@ -3977,12 +3993,46 @@ class GridWindow(tk.Toplevel):
         )
 
 
+    def draw_resolution_arrows(self):
+        # First, collect all chord positions
+        chord_positions = []
+        for col, event_key in enumerate(self.sorted_events):
+            chords_by_root = self.get_chords_by_root(event_key)
+            
+            for root, chord in chords_by_root.items():
+                if root not in self.root_to_row:
+                    continue
+                row = self.root_to_row[root]
+                x = self.PADDING + col * self.CELL_SIZE + self.CELL_SIZE // 2
+                y = self.PADDING + row * self.CELL_SIZE + self.CELL_SIZE // 2
+                chord_positions.append((col, row, x, y, chord))
+        
+        # Draw arrows from grid centers (will be hidden behind chord shapes)
+        pos_dict = {(col, row): (x, y, chord) for col, row, x, y, chord in chord_positions}
+        # Every arrow points to the diagonal neighbour, so its end offset is constant
+        end_offset = self.CELL_SIZE * 0.55  # Reduced from 0.75 to make arrows longer
+        dist = (2 * self.CELL_SIZE ** 2) ** 0.5
+        end_dx = self.CELL_SIZE / dist * end_offset
+        end_dy = self.CELL_SIZE / dist * end_offset
+        for (col, row), (x1, y1, chord1) in pos_dict.items():
+            diag_pos = (col + 1, row + 1)
+            if diag_pos in pos_dict:
+                x2, y2, chord2 = pos_dict[diag_pos]
+                # Start from grid center (not circle edge)
+                self.canvas.create_line(x1, y1, x2 - end_dx, y2 - end_dy, arrow=tk.LAST, fill="black", width=3, tags="resolution_arrow")
+
+    def get_chords_by_root(self, event_key):
+        """Map each chord root of an event to its chord (the last chord per root wins), cached per event."""
+        chords_by_root = self._chords_by_root.get(event_key)
+        if chords_by_root is None:
+            chords_by_root = self._chords_by_root[event_key] = {}
+            for chord in self.events[event_key].get("chords", []):
+                chords_by_root[self.get_root(chord)] = chord
+        return chords_by_root
+
     def get_root(self, chord_name):
-        for note in sorted(NOTE_TO_SEMITONE.keys(), key=lambda x: -len(x)):
-            if chord_name.startswith(note):
-                canonical = ENHARMONIC_EQUIVALENTS.get(note, note)
-                return canonical
-        return None
+        note = chord_root(chord_name)
+        return canonical_root(note) if note else None
 
     def on_mouse_move(self, event):
         # Adjust for canvas scroll offset
@@ -3992,25 +4042,39 @@ class GridWindow(tk.Toplevel):
         closest = None
         tooltip_text = None
 
-        # --- Check chord hover (existing logic) ---
-        for col, row, x, y, chord in self.chord_positions:
+        # --- Check chord hover ---
+        # hover_radius is below CELL_SIZE, so only chords in the cell under the pointer
+        # and its eight neighbours can be hit; the earliest-drawn hit wins, as in a full scan
+        col = int((mx - self.PADDING) // self.CELL_SIZE)
+        row = int((my - self.PADDING) // self.CELL_SIZE)
+        best = None
+        for cell in ((c, r) for c in (col - 1, col, col + 1) for r in (row - 1, row, row + 1)):
+            hit = self._chord_pos_by_cell.get(cell)
+            if hit is None or (best is not None and hit[0] > best[0]):
+                continue
+            _, x, y, chord = hit
             if abs(mx - x) < hover_radius and abs(my - y) < hover_radius:
                 dist = ((mx - x) ** 2 + (my - y) ** 2) ** 0.5
                 if dist < hover_radius:
-                    closest = (x, y)
-                    tooltip_text = beautify_chord(chord)
-                    break
+                    best = hit
+        if best is not None:
+            _, x, y, chord = best
+            closest = (x, y)
+            tooltip_text = beautify_chord(chord)
 
         # --- If no chord found, check entropy hover ---
         if tooltip_text is None and hasattr(self, "entropy_points"):
             hover_radius = 6  # tighter tolerance for entropy dots
-            for x, y, H in self.entropy_points:
+            # Entropy dots sit one per column at the cell centres, far more than
+            # 2 * hover_radius apart, so only the nearest column's dot can be hit
+            idx = round((mx - self.PADDING - self.CELL_SIZE // 2) / self.CELL_SIZE)
+            if 0 <= idx < len(self.entropy_points):
+                x, y, H = self.entropy_points[idx]
                 if abs(mx - x) < hover_radius and abs(my - y) < hover_radius:
                     dist = ((mx - x) ** 2 + (my - y) ** 2) ** 0.5
                     if dist < hover_radius:
                         closest = (x, y)
                         tooltip_text = f"H = {H:.3f}"
-                        break
 
         # --- Show tooltip if something is hovered ---
         if closest and tooltip_text:
@@ -4022,7 +4086,9 @@ class GridWindow(tk.Toplevel):
             
 from typing import List, Tuple, Dict, Any, Optional, Callable, Set
 from collections import Counter
+from itertools import chain
 from math import log2
+from types import MappingProxyType
 
 class DriveStrengthParametersDialog:
     """Dialog for configuring drive strength parameters and rule bonuses."""
@@ -4068,8 +4134,6 @@ class DriveStrengthParametersDialog:
         self.window.configure(bg="#f5f5f5")  # Set light gray background
         
         # Configure styles to match main settings dialog
-        import platform
-        from tkinter import ttk
         style = ttk.Style()
         style.configure("Dialog.TFrame", background="#f5f5f5")
         style.configure("Dialog.TLabel", background="#f5f5f5", foreground="black", font=("Segoe UI", 9))
@@ -4535,7 +4599,7 @@ class DriveStrengthParametersDialog:
         """Save current parameters to a preset file."""
         import json
         import datetime
-        from tkinter import filedialog, simpledialog
+        from tkinter import simpledialog
         
         # Get preset name from user
         preset_name = simpledialog.askstring(
@@ -4591,7 +4655,6 @@ class DriveStrengthParametersDialog:
     def load_preset(self):
         """Load parameters from a preset file."""
         import json
-        from tkinter import filedialog
         
         # Ask for file to load
         filename = filedialog.askopenfilename(
@@ -4618,13 +4681,13 @@ class DriveStrengthParametersDialog:
             strength_map = preset_data["strength_map"]
             for chord_symbol, var in self.strength_vars.items():
                 if chord_symbol in strength_map:
-                    var.set(str(strength_map[chord_symbol]))
+                    self._set_var_if_changed(var, strength_map[chord_symbol])
             
             # Load rule values
             rule_params = preset_data["rule_params"]
             for rule_key, var in self.rule_vars.items():
                 if rule_key in rule_params:
-                    var.set(str(rule_params[rule_key]))
+                    self._set_var_if_changed(var, rule_params[rule_key])
             
             preset_name = preset_data.get("name", "Unknown")
             messagebox.showinfo("Success", f"Preset '{preset_name}' loaded successfully!", parent=self.window)
@@ -4632,15 +4695,22 @@ class DriveStrengthParametersDialog:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load preset:\n{str(e)}", parent=self.window)
     
+    @staticmethod
+    def _set_var_if_changed(var, value):
+        """Set a Tk variable only when its text differs, so unchanged entries fire no traces."""
+        value = str(value)
+        if var.get() != value:
+            var.set(value)
+
     def reset_defaults(self):
         """Reset all values to defaults."""
         # Reset strength values
         for chord_symbol, var in self.strength_vars.items():
-            var.set(str(self.DEFAULT_STRENGTH_MAP.get(chord_symbol, 0)))
+            self._set_var_if_changed(var, self.DEFAULT_STRENGTH_MAP.get(chord_symbol, 0))
         
         # Reset rule values
         for rule_key, var in self.rule_vars.items():
-            var.set(str(self.DEFAULT_RULE_PARAMS.get(rule_key, 0)))
+            self._set_var_if_changed(var, self.DEFAULT_RULE_PARAMS.get(rule_key, 0))
 
 class EntropyAnalyzer:
     """
@@ -4655,7 +4725,7 @@ class EntropyAnalyzer:
         'F': 5, 'F#': 6, 'Gb': 6, 'G': 7, 'G#': 8, 'Ab': 8, 'A': 9,
         'A#': 10, 'Bb': 10, 'B': 11
     }
-    _STRENGTH_MAP = {
+    _STRENGTH_MAP = MappingProxyType({
         "7": 100,
         "7b5": 90,
         "7#5": 80,
@@ -4670,7 +4740,27 @@ class EntropyAnalyzer:
         "m": 35,
         "maj7": 30,
         "mMaj7": 25,
-    }
+    })
+    # Default rule parameters (synchronized with dialog defaults)
+    _DEFAULT_RULE_PARAMS = MappingProxyType({
+        "rule1_bass_support": 20,
+        "rule2_tonic_dominant": 50,
+        "rule2_selected_tonic": "No Tonic",  # Default: disabled
+        "rule3_root_repetition": 20,
+        "rule4_resolution_max": 50,
+        "rule5_clean_voicing": 50,
+        "rule6_same_chord": 33,
+        "rule6_dominant_prep": 50,
+        "rule7_root_doubled": 33,
+        "rule7_root_tripled": 50
+    })
+    # chord name -> (root, quality), shared by all analyzers; filled in by _split_chord
+    _CHORD_SPLITS: Dict[str, Tuple[str, str]] = {}
+    # Signed bonus in a rule message, e.g. "+20" in "Rule 1: Bass supports C7 → +20 bonus"
+    _BONUS_RE = re.compile(r"([+-]\d+(?:\.\d+)?)")
+    # root -> note a fourth / fifth above, filled in by _fourth_up / _fifth_up for roots they can name
+    _FOURTHS_UP: Dict[str, str] = {}
+    _FIFTHS_UP: Dict[str, str] = {}
 
     def __init__(
         self,
@@ -4687,33 +4777,28 @@ class EntropyAnalyzer:
         self.logger = logger
         self.custom_steps: List[Tuple[str, Callable[["EntropyAnalyzer"], None]]] = []
         
-        # Use provided parameters or defaults
-        self.strength_map = strength_map if strength_map is not None else self._STRENGTH_MAP.copy()
-        
-        # Default rule parameters (synchronized with dialog defaults)
-        default_rule_params = {
-            "rule1_bass_support": 20,
-            "rule2_tonic_dominant": 50,
-            "rule2_selected_tonic": "No Tonic",  # Default: disabled
-            "rule3_root_repetition": 20,
-            "rule4_resolution_max": 50,
-            "rule5_clean_voicing": 50,
-            "rule6_same_chord": 33,
-            "rule6_dominant_prep": 50,
-            "rule7_root_doubled": 33,
-            "rule7_root_tripled": 50
-        }
-        self.rule_params = rule_params if rule_params is not None else default_rule_params
+        # Use provided parameters or the shared read-only defaults (never mutated here)
+        self.strength_map = strength_map if strength_map is not None else self._STRENGTH_MAP
+        self.rule_params = rule_params if rule_params is not None else self._DEFAULT_RULE_PARAMS
+
+        # Rule 2 tonic is fixed for the whole analysis, resolve its dominant once
+        selected_tonic = self.rule_params.get("rule2_selected_tonic", "No Tonic")
+        self._rule2_tonic = selected_tonic
+        self._rule2_dominant = None if selected_tonic == "No Tonic" else self._get_dominant_of_tonic(selected_tonic)
 
     # --------------------------
     # Stage 1: Chord strengths
     # --------------------------
     def _fourth_up(self, root: str) -> str:
         """Return the note a perfect fourth above the given root."""
+        fourth = self._FOURTHS_UP.get(root)
+        if fourth is not None:
+            return fourth
         # Handle empty or None input
         if not root or root.strip() == "":
             return ""
             
+        key = root
         root = root.strip()
         chromatic_sharps = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
         flats_to_sharps = {'Db': 'C#', 'Eb': 'D#', 'Fb': 'E', 'Gb': 'F#', 'Ab': 'G#', 'Bb': 'A#', 'Cb': 'B'}
@@ -4740,14 +4825,19 @@ class EntropyAnalyzer:
             return root
         index = chromatic_sharps.index(note)
         fourth_index = (index + 5) % 12  # perfect fourth = +5 semitones
-        return chromatic_sharps[fourth_index]
+        fourth = self._FOURTHS_UP[key] = chromatic_sharps[fourth_index]
+        return fourth
 
     def _fifth_up(self, root: str) -> str:
         """Return the note a perfect fifth above the given root."""
+        fifth = self._FIFTHS_UP.get(root)
+        if fifth is not None:
+            return fifth
         # Handle empty or None input
         if not root or root.strip() == "":
             return ""
             
+        key = root
         root = root.strip()
         chromatic_sharps = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
         flats_to_sharps = {'Db': 'C#', 'Eb': 'D#', 'Fb': 'E', 'Gb': 'F#', 'Ab': 'G#', 'Bb': 'A#', 'Cb': 'B'}
@@ -4771,17 +4861,23 @@ class EntropyAnalyzer:
             return root
         index = chromatic_sharps.index(note)
         fifth_index = (index + 7) % 12  # perfect fifth = +7 semitones
-        return chromatic_sharps[fifth_index]
+        fifth = self._FIFTHS_UP[key] = chromatic_sharps[fifth_index]
+        return fifth
 
 
     def step_stage1_strengths(self, print_legend: bool = True):
-        import re
         root_counter: Dict[str, int] = {}
-        prev_event_roots: Set[str] = set()
         pending_roots: Set[str] = set()
         resolution_count: Dict[str, int] = {}
         total_resolutions: int = 0
         prev_event_chords: Set[str] = set()
+        # Per-event chord scores without the context rules (3, 4, 6), for the entropy summary
+        entropy_event_scores: List[List[float]] = []
+        # Context-rule parameters are fixed for the whole pass
+        rule3_multiplier = self.rule_params.get("rule3_root_repetition", 2)
+        rule4_max = self.rule_params.get("rule4_resolution_max", 10)
+        rule6_same = self.rule_params.get("rule6_same_chord", 5)
+        rule6_dom = self.rule_params.get("rule6_dominant_prep", 10)
 
         # Prepare table data
         table_rows = []
@@ -4790,27 +4886,33 @@ class EntropyAnalyzer:
         for (bar, beat, ts), payload in self.events.items():
             chords = payload.get("chords", [])
             basses = payload.get("basses", [])
-            chord_scores: List[Tuple[str, float, List[str]]] = []
+            chord_scores: List[Tuple[str, float, List[str], float]] = []
             current_event_roots: Set[str] = set()
             event_label = f"Bar {bar}, Beat {beat} ({ts})"
 
+            event_scores = []
             # For each chord, collect which rules applied
             for chord in chords:
-                root, quality = self._split_chord(chord)
-                # Pass root_counter for R3
-                base_score, rule_msgs = self._compute_score(chord, basses, payload, root_counter=root_counter)
+                root, quality = split = self._split_chord(chord)
+                base_score, rule_msgs = self._compute_score(chord, basses, payload, split=split)
+                event_scores.append(base_score)
                 applied_rules = rule_msgs[:]
 
+                # Rule 3: root repetition
+                prev_count = root_counter.get(root, 0)
+                r3_bonus = rule3_multiplier * prev_count if prev_count > 0 else 0
+                if r3_bonus > 0:
+                    applied_rules.append(f"Rule 3: Root {root} repeated → +{r3_bonus}")
+                base_score += r3_bonus
+
                 # Rule 6: Previous event contains same chord or dominant chord
                 rule6_bonus = 0
                 dominant_root = self._fifth_up(root)
                 dominant_chord = dominant_root + quality
                 if chord in prev_event_chords:
-                    rule6_same = self.rule_params.get("rule6_same_chord", 5)
                     rule6_bonus += rule6_same
                     applied_rules.append(f"Rule 6: Previous event contained {chord} → +{rule6_same}")
                 if dominant_chord in prev_event_chords:
-                    rule6_dom = self.rule_params.get("rule6_dominant_prep", 10)
                     rule6_bonus += rule6_dom
                     applied_rules.append(f"Rule 6: Previous event contained dominant {dominant_chord} → +{rule6_dom}")
                 base_score += rule6_bonus
@@ -4818,57 +4920,63 @@ class EntropyAnalyzer:
                 # Rule 4: proportional resolution
                 if total_resolutions > 0:
                     ratio = resolution_count.get(root, 0) / total_resolutions
-                    rule4_max = self.rule_params.get("rule4_resolution_max", 10)
                     r4_bonus = rule4_max * ratio
                     if r4_bonus > 0:
                         applied_rules.append(f"Rule 4: Resolution ratio {ratio:.2f} → +{int(round(r4_bonus))}")
                     base_score += r4_bonus
 
-                chord_scores.append((chord, base_score, applied_rules))
+                chord_scores.append((chord, base_score, applied_rules, self.strength_map.get(quality or "", 0)))
                 current_event_roots.add(root)
 
                 # Update root_counter for R3
-                prev_count = root_counter.get(root, 0)
                 root_counter[root] = prev_count + 1
 
             # Update Rule4 counters
             for prev_root in pending_roots:
-                for cur_root in current_event_roots:
-                    if cur_root == self._fourth_up(prev_root):
-                        resolution_count[prev_root] = resolution_count.get(prev_root, 0) + 1
-                        total_resolutions += 1
+                if self._fourth_up(prev_root) in current_event_roots:
+                    resolution_count[prev_root] = resolution_count.get(prev_root, 0) + 1
+                    total_resolutions += 1
 
             # Build table row for each chord
-            for chord, score, rules in chord_scores:
+            for chord, score, rules, base_strength in chord_scores:
                 row = [event_label + f" {chord}"]
+                # First message of each rule ("Rule N: ..."), found in a single pass
+                rule_messages: Dict[str, str] = {}
+                for r in rules:
+                    if r[:5] == "Rule " and r[6:7] in (":", " "):
+                        rule_messages.setdefault(r[5], r)
                 # For each rule, extract just the bonus points (e.g., +10, +5)
-                for i in range(1, 8):
-                    found = next((r for r in rules if r.startswith(f"Rule {i}:") or r.startswith(f"Rule {i} ")), "")
+                for i in "1234567":
+                    found = rule_messages.get(i)
+                    if found is None:
+                        row.append("")
+                        continue
                     # Extract only the bonus after a + or - sign (not the rule number)
-                    match = re.search(r"([+-]\d+(?:\.\d+)?)", found)
+                    match = self._BONUS_RE.search(found)
                     cell = match.group(1) if match else ""
                     row.append(cell)
-                table_rows.append(row)
+                table_rows.append((row, base_strength))
 
             # Prepare for next event
-            pending_roots = current_event_roots.copy()
-            prev_event_roots = current_event_roots.copy()
-            prev_event_chords = set(chords)
+            # current_event_roots is rebound to a fresh set for each event, so no copy is needed
+            pending_roots = current_event_roots
+            # Events are not modified here, so a chord set can be shared rather than copied
+            prev_event_chords = chords if isinstance(chords, (set, frozenset)) else set(chords)
+            if event_scores:
+                entropy_event_scores.append(event_scores)
 
         # Print table - wider first column for longer chord names
         col_widths = [35, 6] + [4]*7 + [6]
         header = ["Event/Chord", "base"] + rule_names + ["Total"]
         header_line = " | ".join(h.ljust(w) for h, w in zip(header, col_widths))
         sep_line = "-+-".join("-"*w for w in col_widths)
-        self.logger(header_line)
-        self.logger(sep_line)
+        # Collect the table and log it in one call (the loggers print each message as its own line(s))
+        table_lines = [header_line, sep_line]
+        # Every data cell is right-aligned in its column
+        row_format = " | ".join(f"{{!s:>{w}}}" for w in col_widths)
 
-        for row in table_rows:
+        for row, base_strength in table_rows:
             label = row[0]
-            chord_name = label.split()[-1]
-            # Get base strength from strength_map
-            _, quality = self._split_chord(chord_name)
-            base_strength = self.strength_map.get(quality or "", 0)
             total = base_strength
             for cell in row[1:]:
                 try:
@@ -4878,37 +4986,27 @@ class EntropyAnalyzer:
             # Format total as int if possible
             total_str = str(int(total)) if total == int(total) else f"{total:.2f}"
             # Insert base_strength as the second column
-            self.logger(" | ".join(str(cell).rjust(w) for cell, w in zip([label, base_strength] + row[1:] + [total_str], col_widths)))
+            table_lines.append(row_format.format(label, base_strength, *row[1:], total_str))
 
-        self.logger("")  # Add a blank line before the legend
+        table_lines.append("")  # Add a blank line before the legend
+        self.logger("\n".join(table_lines))
 
         # --- Compute and print average and maximum entropy ---
         entropy_values = []
-        for payload in self.events.values():
-            chords = payload.get("chords", [])
-            if not chords:
-                continue
-            # For each event, compute entropy of the chord strengths (base + bonuses)
-            event_scores = []
-            for chord in chords:
-                score, _ = self._compute_score(chord, payload.get("basses", []), payload)
-                event_scores.append(score)
-            if event_scores:
-                # Use Shannon entropy of the event's chord scores
-                from math import log2
-                from collections import Counter
-                counts = Counter(event_scores)
-                total = sum(counts.values())
-                entropy = -sum((count/total) * log2(count/total) for count in counts.values()) if total > 0 else 0.0
-                entropy_values.append(entropy)
+        # For each event, compute entropy of the chord strengths (base + bonuses),
+        # reusing the scores from the table pass above
+        # (only events with chords are listed, so total is never 0)
+        for event_scores in entropy_event_scores:
+            # Use Shannon entropy of the event's chord scores
+            total = len(event_scores)
+            entropy = -sum((count/total) * log2(count/total) for count in Counter(event_scores).values())
+            entropy_values.append(entropy)
         if entropy_values:
             avg_entropy = sum(entropy_values) / len(entropy_values)
             max_entropy = max(entropy_values)
-            self.logger(f"Average entropy = {avg_entropy:.3f} bits")
-            self.logger(f"Maximum entropy = {max_entropy:.3f} bits")
+            self.logger(f"Average entropy = {avg_entropy:.3f} bits\nMaximum entropy = {max_entropy:.3f} bits")
         else:
-            self.logger("Average entropy = 0.000 bits")
-            self.logger("Maximum entropy = 0.000 bits")
+            self.logger("Average entropy = 0.000 bits\nMaximum entropy = 0.000 bits")
 
         legend = (
             "Legend for Entropy Grid:\n"
@@ -4941,8 +5039,8 @@ class EntropyAnalyzer:
         total = sum(scores)
         if total == 0:
             return 0.0
-        probs = [s / total for s in scores]
-        return -sum(p * log2(p) / log2(base) for p in probs if p > 0)
+        log_base = log2(base)
+        return -sum(p * log2(p) / log_base for p in (s / total for s in scores) if p > 0)
 
     def step_stage2_strength_entropy(self):
         scores = self._make_score_sequence()
@@ -4967,8 +5065,12 @@ class EntropyAnalyzer:
         }
         return dominant_map.get(tonic, 'G')  # Default to G if unknown tonic
 
-    def _compute_score(self, chord: str, basses: Optional[List[str]] = None, event_payload: Optional[dict] = None, root_counter: Optional[Dict[str, int]] = None) -> Tuple[int, List[str]]:
-        root, quality = self._split_chord(chord)
+    def _compute_score(self, chord: str, basses: Optional[List[str]] = None, event_payload: Optional[dict] = None, with_messages: bool = True, split: Optional[Tuple[str, str]] = None) -> Tuple[int, List[str]]:
+        """
+        Score a chord by base strength plus Rules 1, 2, 5 and 7; with_messages=False skips the rule
+        descriptions, and callers that already split the chord can pass its (root, quality) as split.
+        """
+        root, quality = split or self._split_chord(chord)
         score = self.strength_map.get(quality or "", 0)
         messages: List[str] = []
 
@@ -4976,43 +5078,39 @@ class EntropyAnalyzer:
         if basses and root in basses:
             rule1_bonus = self.rule_params.get("rule1_bass_support", 20)
             score += rule1_bonus
-            messages.append(f"Rule 1: Bass supports {chord} → +{rule1_bonus} bonus")
+            if with_messages:
+                messages.append(f"Rule 1: Bass supports {chord} → +{rule1_bonus} bonus")
 
         # Rule 2: Tonic-Dominant relationship
-        selected_tonic = self.rule_params.get("rule2_selected_tonic", "No Tonic")
-        if selected_tonic != "No Tonic":
-            dominant_of_tonic = self._get_dominant_of_tonic(selected_tonic)
-            if root == dominant_of_tonic:
-                rule2_bonus = self.rule_params.get("rule2_tonic_dominant", 50)
-                score += rule2_bonus
-                messages.append(f"Rule 2: {chord} is dominant of {selected_tonic} → +{rule2_bonus} bonus")
-
-        # Rule 3: root repetition (now always included)
-        if root_counter is not None:
-            prev_count = root_counter.get(root, 0)
-            rule3_multiplier = self.rule_params.get("rule3_root_repetition", 2)
-            r3_bonus = rule3_multiplier * prev_count if prev_count > 0 else 0
-            if r3_bonus > 0:
-                messages.append(f"Rule 3: Root {root} repeated → +{r3_bonus}")
-            score += r3_bonus
+        if self._rule2_dominant is not None and root == self._rule2_dominant:
+            rule2_bonus = self.rule_params.get("rule2_tonic_dominant", 50)
+            score += rule2_bonus
+            if with_messages:
+                messages.append(f"Rule 2: {chord} is dominant of {self._rule2_tonic} → +{rule2_bonus} bonus")
+
+        # Rule 3 (root repetition) depends on the preceding events and is applied
+        # by step_stage1_strengths, alongside Rules 4 and 6
 
         if event_payload is not None:
-            chord_info = event_payload.get("chord_info", {})
+            info = event_payload.get("chord_info", {}).get(chord, {})
             # Rule 5
-            if chord_info.get(chord, {}).get("clean_stack"):
+            if info.get("clean_stack"):
                 rule5_bonus = self.rule_params.get("rule5_clean_voicing", 10)
                 score += rule5_bonus
-                messages.append(f"Rule 5: Clean chord {chord} → +{rule5_bonus} bonus")
+                if with_messages:
+                    messages.append(f"Rule 5: Clean chord {chord} → +{rule5_bonus} bonus")
             # Rule 7
-            root_count = chord_info.get(chord, {}).get("root_count", 1)
+            root_count = info.get("root_count", 1)
             if root_count == 2:
                 rule7_doubled = self.rule_params.get("rule7_root_doubled", 5)
                 score += rule7_doubled
-                messages.append(f"Rule 7: Root doubled in chord {chord} → +{rule7_doubled} bonus")
+                if with_messages:
+                    messages.append(f"Rule 7: Root doubled in chord {chord} → +{rule7_doubled} bonus")
             elif root_count >= 3:
                 rule7_tripled = self.rule_params.get("rule7_root_tripled", 10)
                 score += rule7_tripled
-                messages.append(f"Rule 7: Root tripled+ in chord {chord} → +{rule7_tripled} bonus")
+                if with_messages:
+                    messages.append(f"Rule 7: Root tripled+ in chord {chord} → +{rule7_tripled} bonus")
 
         return score, messages
 
@@ -5024,18 +5122,18 @@ class EntropyAnalyzer:
             basses = payload.get("basses", [])
             event_scores: List[int] = []
             for chord in chords:
-                score, _ = self._compute_score(chord, basses, payload)  # Pass payload here!
+                score, _ = self._compute_score(chord, basses, payload, with_messages=False)  # Pass payload here!
                 event_scores.append(score)
             scored_events.append(event_scores)
         return scored_events
 
     def _make_score_sequence(self) -> List[int]:
-        seq: List[int] = []
-        for scores in self._make_score_stream():
-            seq.extend(scores)
-        return seq
+        return list(chain.from_iterable(self._make_score_stream()))
 
     def _split_chord(self, chord: str) -> Tuple[str, str]:
+        split = self._CHORD_SPLITS.get(chord)
+        if split is not None:
+            return split
         if not chord:
             return ("", "")
         if len(chord) > 1 and chord[1] in ["#", "b", "♯", "♭"]:
@@ -5044,14 +5142,16 @@ class EntropyAnalyzer:
         else:
             root = chord[0]
             quality = chord[1:]
-        return root, quality
+        split = self._CHORD_SPLITS[chord] = (root, quality)
+        return split
 
     def _shannon_entropy(self, seq: List[Any], base: int = 2) -> float:
         if not seq:
             return 0.0
         counts = Counter(seq)
         total = len(seq)
-        return -sum((count / total) * log2(count / total) / log2(base) for count in counts.values())
+        log_base = log2(base)
+        return -sum((count / total) * log2(count / total) / log_base for count in counts.values())
 
     # --------------------------
     # Public API